@@ -1,9 +1,15 @@
 from app.ast.expr import Expr, Binary, Grouping, Literal, Unary
+from app.ast.trampoline import trampoline
 
 
 class AstPrinter:
+    # Visit methods append to self.parts instead of returning strings, so
+    # printing is linear in the size of the tree, and run on trampoline() so
+    # nesting depth is not limited by the Python stack.
     def print(self, expr: Expr):
-        return expr.accept(self)
+        self.parts = []
+        trampoline(expr.accept(self))
+        return "".join(self.parts)
 
     def visit_binary_expr(self, expr: Binary):
         return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
@@ -13,16 +19,16 @@ class AstPrinter:
 
     def visit_literal_expr(self, expr: Literal):
         if expr.value is None:
-            return "nil"
-        return str(expr.value)
+            self.parts.append("nil")
+        else:
+            self.parts.append(str(expr.value))
 
     def visit_unary_expr(self, expr: Unary):
         return self.parenthesize(expr.operator.lexeme, expr.right)
 
     def parenthesize(self, name, *exprs):
-        result = "(" + name
+        self.parts.append("(" + name)
         for expr in exprs:
-            result += " "
-            result += expr.accept(self)
-        result += ")"
-        return result
\ No newline at end of file
+            self.parts.append(" ")
+            yield expr.accept(self)
+        self.parts.append(")")
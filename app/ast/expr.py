@@ -3,13 +3,19 @@ from typing import List, Any
 from app.token.token import Token
 
 
+# Nodes use __slots__: large machine-generated scripts keep millions of them
+# alive, and a per-instance __dict__ would roughly double their size.
 class Expr(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor):
         pass
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -20,6 +26,8 @@ class Binary(Expr):
 
 
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
@@ -28,6 +36,8 @@ class Grouping(Expr):
 
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value: Any):
         self.value = value
 
@@ -36,6 +46,8 @@ class Literal(Expr):
 
 
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
@@ -45,23 +57,34 @@ class Unary(Expr):
 
 
 class Variable(Expr):
+    __slots__ = ("name", "depth", "slot")
+
     def __init__(self, name: Token):
         self.name = name
+        # Filled in by the Resolver; depth None means a global lookup by name
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_variable_expr(self)
 
 
 class Assign(Expr):
+    __slots__ = ("name", "value", "depth", "slot")
+
     def __init__(self, name: Token, value: Expr):
         self.name = name
         self.value = value
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_assign_expr(self)
 
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -73,13 +96,23 @@ class Logical(Expr):
 
 # Statement classes
 class Stmt(ABC):
+    # Source line the statement starts on, set by the Parser. Statements
+    # synthesized later (desugaring, optimization) may keep None.
+    # height is the depth of the statement's subtree, set by the Resolver;
+    # the Interpreter runs very deep statements on an explicit stack.
+    __slots__ = ("line", "height")
+
     @abstractmethod
     def accept(self, visitor):
         pass
 
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
+        self.line = None
+        self.height = 0
         self.expression = expression
 
     def accept(self, visitor):
@@ -87,7 +120,11 @@ class Expression(Stmt):
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression: Expr):
+        self.line = None
+        self.height = 0
         self.expression = expression
 
     def accept(self, visitor):
@@ -95,24 +132,41 @@ class Print(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer", "slot")
+
     def __init__(self, name: Token, initializer: Expr):
+        self.line = None
+        self.height = 0
         self.name = name
         self.initializer = initializer
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_var_stmt(self)
 
 
 class Block(Stmt):
+    __slots__ = ("statements", "slot_count", "scoped")
+
     def __init__(self, statements: List[Stmt]):
+        self.line = None
+        self.height = 0
         self.statements = statements
+        self.slot_count = 0
+        # The Resolver clears this for blocks that declare nothing; those run
+        # in the enclosing environment
+        self.scoped = True
 
     def accept(self, visitor):
         return visitor.visit_block_stmt(self)
 
 
 class If(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(self, condition: Expr, then_branch: Stmt, else_branch: Stmt):
+        self.line = None
+        self.height = 0
         self.condition = condition
         self.then_branch = then_branch
         self.else_branch = else_branch
@@ -122,9 +176,15 @@ class If(Stmt):
 
 
 class While(Stmt):
+    __slots__ = ("condition", "body", "counted")
+
     def __init__(self, condition: Expr, body: Stmt):
+        self.line = None
+        self.height = 0
         self.condition = condition
         self.body = body
+        # CountedLoop filled in by the Resolver when the loop has that shape
+        self.counted = None
 
     def accept(self, visitor):
         return visitor.visit_while_stmt(self)
\ No newline at end of file
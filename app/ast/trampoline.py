@@ -0,0 +1,41 @@
+from types import GeneratorType
+
+
+def trampoline(generator):
+    # Runs a recursive computation written as generators without growing the
+    # Python stack. A generator yields a sub-computation (another generator)
+    # and is resumed with its return value; anything else it yields is sent
+    # straight back, so a visitor's leaf methods can stay plain functions and
+    # `yield node.accept(visitor)` works for every node. Exceptions propagate
+    # through the suspended generators as with ordinary calls, so their
+    # finally blocks run. Nesting depth is limited by memory only.
+    if generator.__class__ is not GeneratorType:
+        return generator
+    stack = [generator]
+    value = None
+    error = None
+    while True:
+        try:
+            if error is None:
+                child = stack[-1].send(value)
+            else:
+                pending, error = error, None
+                child = stack[-1].throw(pending)
+        except StopIteration as stop:
+            stack.pop()
+            if not stack:
+                return stop.value
+            value = stop.value
+            continue
+        except BaseException as exception:
+            stack.pop()
+            if not stack:
+                raise
+            error = exception
+            continue
+
+        if child.__class__ is GeneratorType:
+            stack.append(child)
+            value = None
+        else:
+            value = child
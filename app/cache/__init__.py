@@ -0,0 +1 @@
+# Cache module for the Lox interpreter
\ No newline at end of file
@@ -0,0 +1,183 @@
+import marshal
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.token.token import Token
+from app.ast.trampoline import trampoline
+from app.token.token_buffer import TOKEN_TYPES, TYPE_CODES
+
+
+# The tree is written in postfix order as one flat list: each node is its
+# tag followed by its non-node fields, after the nodes it contains. Tokens
+# are (type code, lexeme, literal, line), and the list is marshalled. A flat
+# list keeps marshal (which refuses deeply nested data) out of the way and
+# lets both directions run without recursion. Statements also keep the
+# source line recorded by the Parser.
+BINARY, GROUPING, LITERAL, UNARY, VARIABLE, ASSIGN, LOGICAL = range(7)
+EXPRESSION, PRINT, VAR, BLOCK, IF, WHILE = range(7, 13)
+
+FORMAT_MAGIC = b"LOXAST2\n"
+
+
+class AstSerializer:
+    # Visit methods are generators run by trampoline()
+    def __init__(self):
+        # marshal writes a back-reference for an object it has already seen,
+        # so sharing equal token tuples makes repeated names and operators
+        # cost a few bytes each instead of a full copy
+        self.tokens = {}
+        self.code = []
+
+    def serialize(self, statements):
+        self.code = []
+        for stmt in statements:
+            trampoline(stmt.accept(self))
+        return FORMAT_MAGIC + marshal.dumps(self.code)
+
+    def token(self, token):
+        key = (TYPE_CODES[token.type], token.lexeme, token.literal, token.line)
+        return self.tokens.setdefault(key, key)
+
+    def visit_expression_stmt(self, stmt: Expression):
+        yield stmt.expression.accept(self)
+        self.code += (EXPRESSION, stmt.line)
+
+    def visit_print_stmt(self, stmt: Print):
+        yield stmt.expression.accept(self)
+        self.code += (PRINT, stmt.line)
+
+    def visit_var_stmt(self, stmt: Var):
+        if stmt.initializer is not None:
+            yield stmt.initializer.accept(self)
+        self.code += (VAR, stmt.line, self.token(stmt.name), stmt.initializer is not None)
+
+    def visit_block_stmt(self, stmt: Block):
+        for statement in stmt.statements:
+            yield statement.accept(self)
+        self.code += (BLOCK, stmt.line, len(stmt.statements))
+
+    def visit_if_stmt(self, stmt: If):
+        yield stmt.condition.accept(self)
+        yield stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            yield stmt.else_branch.accept(self)
+        self.code += (IF, stmt.line, stmt.else_branch is not None)
+
+    def visit_while_stmt(self, stmt: While):
+        yield stmt.condition.accept(self)
+        yield stmt.body.accept(self)
+        self.code += (WHILE, stmt.line)
+
+    def visit_binary_expr(self, expr: Binary):
+        yield expr.left.accept(self)
+        yield expr.right.accept(self)
+        self.code += (BINARY, self.token(expr.operator))
+
+    def visit_grouping_expr(self, expr: Grouping):
+        yield expr.expression.accept(self)
+        self.code.append(GROUPING)
+
+    def visit_literal_expr(self, expr: Literal):
+        self.code += (LITERAL, expr.value)
+
+    def visit_unary_expr(self, expr: Unary):
+        yield expr.right.accept(self)
+        self.code += (UNARY, self.token(expr.operator))
+
+    def visit_variable_expr(self, expr: Variable):
+        self.code += (VARIABLE, self.token(expr.name))
+
+    def visit_assign_expr(self, expr: Assign):
+        yield expr.value.accept(self)
+        self.code += (ASSIGN, self.token(expr.name))
+
+    def visit_logical_expr(self, expr: Logical):
+        yield expr.left.accept(self)
+        yield expr.right.accept(self)
+        self.code += (LOGICAL, self.token(expr.operator))
+
+
+class AstDeserializer:
+    # Rebuilds the tree with an explicit stack: each builder pops the nodes
+    # it contains and pushes the new node. What is left is the statement list.
+    def deserialize(self, data):
+        if not data.startswith(FORMAT_MAGIC):
+            raise ValueError("Not a serialized Lox AST")
+        code = marshal.loads(data[len(FORMAT_MAGIC):])
+        stack = []
+        index = 0
+        while index < len(code):
+            builder, size = self.BUILDERS[code[index]]
+            builder(self, stack, *code[index + 1:index + 1 + size])
+            index += 1 + size
+        return stack
+
+    def token(self, token):
+        type, lexeme, literal, line = token
+        return Token(TOKEN_TYPES[type], lexeme, literal, line)
+
+    def statement(self, stack, stmt, line):
+        stmt.line = line
+        stack.append(stmt)
+
+    def build_expression(self, stack, line):
+        self.statement(stack, Expression(stack.pop()), line)
+
+    def build_print(self, stack, line):
+        self.statement(stack, Print(stack.pop()), line)
+
+    def build_var(self, stack, line, name, has_initializer):
+        initializer = stack.pop() if has_initializer else None
+        self.statement(stack, Var(self.token(name), initializer), line)
+
+    def build_block(self, stack, line, count):
+        statements = stack[len(stack) - count:]
+        del stack[len(stack) - count:]
+        self.statement(stack, Block(statements), line)
+
+    def build_if(self, stack, line, has_else):
+        else_branch = stack.pop() if has_else else None
+        then_branch = stack.pop()
+        self.statement(stack, If(stack.pop(), then_branch, else_branch), line)
+
+    def build_while(self, stack, line):
+        body = stack.pop()
+        self.statement(stack, While(stack.pop(), body), line)
+
+    def build_binary(self, stack, operator):
+        right = stack.pop()
+        stack.append(Binary(stack.pop(), self.token(operator), right))
+
+    def build_grouping(self, stack):
+        stack.append(Grouping(stack.pop()))
+
+    def build_literal(self, stack, value):
+        stack.append(Literal(value))
+
+    def build_unary(self, stack, operator):
+        stack.append(Unary(self.token(operator), stack.pop()))
+
+    def build_variable(self, stack, name):
+        stack.append(Variable(self.token(name)))
+
+    def build_assign(self, stack, name):
+        stack.append(Assign(self.token(name), stack.pop()))
+
+    def build_logical(self, stack, operator):
+        right = stack.pop()
+        stack.append(Logical(stack.pop(), self.token(operator), right))
+
+    # Builder and number of fields after the tag
+    BUILDERS = {
+        BINARY: (build_binary, 1),
+        GROUPING: (build_grouping, 0),
+        LITERAL: (build_literal, 1),
+        UNARY: (build_unary, 1),
+        VARIABLE: (build_variable, 1),
+        ASSIGN: (build_assign, 1),
+        LOGICAL: (build_logical, 1),
+        EXPRESSION: (build_expression, 1),
+        PRINT: (build_print, 1),
+        VAR: (build_var, 3),
+        BLOCK: (build_block, 2),
+        IF: (build_if, 2),
+        WHILE: (build_while, 1),
+    }
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import tempfile
+from app.cache.ast_serializer import AstSerializer, AstDeserializer
+
+
+# Bump whenever the Scanner, Parser or AST shape changes what a given
+# source parses to, so stale entries are never loaded
+CACHE_VERSION = "lox-parse-2"
+
+CACHE_SUFFIX = ".loxast"
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "lox")
+
+
+class ParseCache:
+    # Parsed statement lists on disk, keyed by a hash of the source text and
+    # CACHE_VERSION. A cache that cannot be read or written behaves like an
+    # empty one: every failure is a miss, never an error for the script.
+    def __init__(self, directory=None, max_size=DEFAULT_CACHE_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+        # Total size of the entries as of the last scan plus what this
+        # instance has stored since, so a long-lived cache (LoxRuntime) only
+        # rescans the directory once the bound may have been crossed
+        self.size = None
+
+    def path(self, source):
+        digest = hashlib.sha256(CACHE_VERSION.encode() + b"\0" + source.encode("utf-8", "surrogatepass"))
+        return os.path.join(self.directory, digest.hexdigest() + CACHE_SUFFIX)
+
+    def load(self, source):
+        path = self.path(source)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            statements = AstDeserializer().deserialize(data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, TypeError, IndexError, KeyError):
+            self.remove(path)
+            return None
+
+        # Eviction is by least recent use, so a hit refreshes the entry
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return statements
+
+    def store(self, source, statements):
+        data = AstSerializer().serialize(statements)
+        path = self.path(source)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file in the same directory and rename it
+            # into place, so readers never see a partially written entry
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(temp_path, path)
+            except BaseException:
+                self.remove(temp_path)
+                raise
+            if self.size is None or self.size + len(data) > self.max_size:
+                self.evict()
+            else:
+                self.size += len(data)
+        except OSError:
+            pass
+
+    def evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith(CACHE_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        if total <= self.max_size:
+            self.size = total
+            return
+
+        # Evict down to three quarters of the bound, so a cache at its bound
+        # is not rescanned on every store
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size * 3 // 4:
+                break
+            self.remove(path)
+            total -= size
+        self.size = total
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,313 @@
+from operator import gt, ge, lt, le
+from app.runtime.diagnostic import Diagnostic, LoxError, RUNTIME_ERROR
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.token.token_type import TokenType
+from app.interpreter.environment import SlotEnvironment
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.values import is_equal, is_truthy, stringify
+from app.interpreter.rope import STRING_TYPES, concat
+from app.interpreter.numbers import NUMBER_TYPES, add, subtract, multiply, negate
+from app.interpreter.stack_evaluator import MAX_RECURSIVE_HEIGHT
+from app.runtime.budget import string_limit
+
+
+class ClosureInterpreter(Interpreter):
+    # Compiles the program into nested closures, then runs them.
+    # Operator selection and operand checks are resolved at compile time, so
+    # running a node costs one Python call instead of accept() + visit_*().
+    # Both compiling and running a closure tree recurse, so statements taller
+    # than MAX_RECURSIVE_HEIGHT run on the StackEvaluator instead, as in
+    # Interpreter.interpret.
+
+    def interpret(self, statements):
+        # Top-level statements are compiled one at a time, which also lets
+        # this run on a lazily parsed statement stream.
+        self.string_limit = string_limit(self.budget)
+        compiler = ClosureCompiler(self.globals, self.output, self.budget, self.unchecked)
+        try:
+            for statement in statements:
+                if statement is None:
+                    continue
+                if statement.height > MAX_RECURSIVE_HEIGHT:
+                    self.stack_evaluator.execute(statement)
+                else:
+                    compiler.compile([statement])(self.globals)
+        except RuntimeError as error:
+            raise LoxError(Diagnostic(RUNTIME_ERROR, str(error))) from error
+        finally:
+            self.output.flush()
+            self.unchecked.clear()
+
+
+class ClosureCompiler:
+    # Like Interpreter, relies on the slot indexes recorded by the Resolver
+    def __init__(self, globals, output, budget=None, unchecked=None):
+        self.globals = globals
+        self.output = output
+        self.budget = budget
+        self.string_limit = string_limit(budget)
+        # TypeInference's check-free operations by node, if any
+        self.unchecked = {} if unchecked is None else unchecked
+
+    def compile(self, statements):
+        return self.compile_sequence(statements)
+
+    def compile_sequence(self, statements):
+        compiled = tuple(stmt.accept(self) for stmt in statements if stmt is not None)
+
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def run(env):
+            for stmt in compiled:
+                stmt(env)
+        return run
+
+    def visit_block_stmt(self, stmt: Block):
+        body = self.compile_sequence(stmt.statements)
+        if not stmt.scoped:
+            return body
+        size = stmt.slot_count
+
+        def run(env):
+            body(SlotEnvironment(env, size))
+        return run
+
+    def visit_if_stmt(self, stmt: If):
+        condition = stmt.condition.accept(self)
+        then_branch = stmt.then_branch.accept(self)
+
+        if stmt.else_branch is None:
+            def run(env):
+                if is_truthy(condition(env)):
+                    then_branch(env)
+            return run
+
+        else_branch = stmt.else_branch.accept(self)
+
+        def run(env):
+            if is_truthy(condition(env)):
+                then_branch(env)
+            else:
+                else_branch(env)
+        return run
+
+    def visit_while_stmt(self, stmt: While):
+        condition = stmt.condition.accept(self)
+        body = stmt.body.accept(self)
+        budget = self.budget
+
+        if budget is None:
+            def run(env):
+                while is_truthy(condition(env)):
+                    body(env)
+        else:
+            def run(env):
+                while is_truthy(condition(env)):
+                    body(env)
+                    budget.tick(env)
+        return run
+
+    def visit_var_stmt(self, stmt: Var):
+        name = stmt.name.lexeme
+        slot = stmt.slot
+
+        if stmt.initializer is None:
+            def initializer(env):
+                return None
+        else:
+            initializer = stmt.initializer.accept(self)
+
+        if slot is None:
+            def run(env):
+                env.define(name, initializer(env))
+            return run
+
+        def run(env):
+            env.values[slot] = initializer(env)
+        return run
+
+    def visit_expression_stmt(self, stmt: Expression):
+        expression = stmt.expression.accept(self)
+
+        def run(env):
+            expression(env)
+        return run
+
+    def visit_print_stmt(self, stmt: Print):
+        expression = stmt.expression.accept(self)
+        write_line = self.output.write_line
+
+        def run(env):
+            write_line(stringify(expression(env)))
+        return run
+
+    def visit_variable_expr(self, expr: Variable):
+        name = expr.name
+        depth = expr.depth
+        slot = expr.slot
+
+        if depth is None:
+            get = self.globals.get
+
+            def run(env):
+                return get(name)
+        elif depth == 0:
+            def run(env):
+                return env.values[slot]
+        elif depth == 1:
+            def run(env):
+                return env.enclosing.values[slot]
+        else:
+            def run(env):
+                return env.get_at(depth, slot)
+        return run
+
+    def visit_assign_expr(self, expr: Assign):
+        name = expr.name
+        depth = expr.depth
+        slot = expr.slot
+        value = expr.value.accept(self)
+
+        if depth is None:
+            assign = self.globals.assign
+
+            def run(env):
+                result = value(env)
+                assign(name, result)
+                return result
+        elif depth == 0:
+            def run(env):
+                result = env.values[slot] = value(env)
+                return result
+        else:
+            def run(env):
+                result = value(env)
+                env.assign_at(depth, slot, result)
+                return result
+        return run
+
+    def visit_logical_expr(self, expr: Logical):
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+
+        if expr.operator.type == TokenType.OR:
+            def run(env):
+                value = left(env)
+                if is_truthy(value):
+                    return value
+                return right(env)
+            return run
+
+        def run(env):
+            value = left(env)
+            if not is_truthy(value):
+                return value
+            return right(env)
+        return run
+
+    def visit_binary_expr(self, expr: Binary):
+        left = expr.left.accept(self)
+        right = expr.right.accept(self)
+        operator = expr.operator.type
+
+        # Operand types proven by TypeInference: no checks at all
+        operation = self.unchecked.get(expr)
+        if operation is not None:
+            def run(env):
+                return operation(left(env), right(env))
+            return run
+
+        if operator == TokenType.PLUS:
+            return self.compile_plus(left, right)
+        if operator == TokenType.EQUAL_EQUAL:
+            def run(env):
+                return is_equal(left(env), right(env))
+            return run
+        if operator == TokenType.BANG_EQUAL:
+            def run(env):
+                return not is_equal(left(env), right(env))
+            return run
+        if operator == TokenType.SLASH:
+            def run(env):
+                a = left(env)
+                b = right(env)
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                if b == 0:
+                    raise RuntimeError("Division by zero")
+                return a / b
+            return run
+
+        return NUMBER_OPERATORS[operator](left, right)
+
+    def compile_plus(self, left, right):
+        limit = self.string_limit
+
+        def run(env):
+            a = left(env)
+            b = right(env)
+            if a.__class__ in NUMBER_TYPES:
+                if b.__class__ in NUMBER_TYPES:
+                    return add(a, b)
+                if b.__class__ in STRING_TYPES:
+                    return concat(stringify(a), b, limit)
+            elif a.__class__ in STRING_TYPES:
+                if b.__class__ in STRING_TYPES:
+                    return concat(a, b, limit)
+                if b.__class__ in NUMBER_TYPES:
+                    return concat(a, stringify(b), limit)
+            raise RuntimeError("Operands must be two numbers or two strings.")
+        return run
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return expr.expression.accept(self)
+
+    def visit_literal_expr(self, expr: Literal):
+        value = expr.value
+
+        def run(env):
+            return value
+        return run
+
+    def visit_unary_expr(self, expr: Unary):
+        right = expr.right.accept(self)
+
+        if expr in self.unchecked:
+            def run(env):
+                return negate(right(env))
+            return run
+
+        if expr.operator.type == TokenType.MINUS:
+            def run(env):
+                value = right(env)
+                if value.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operand must be a number.")
+                return negate(value)
+            return run
+
+        def run(env):
+            return not is_truthy(right(env))
+        return run
+
+
+def number_operator(operation):
+    def compile(left, right):
+        def run(env):
+            a = left(env)
+            b = right(env)
+            if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                raise RuntimeError("Operands must be numbers.")
+            return operation(a, b)
+        return run
+    return compile
+
+
+NUMBER_OPERATORS = {
+    TokenType.MINUS: number_operator(subtract),
+    TokenType.STAR: number_operator(multiply),
+    TokenType.GREATER: number_operator(gt),
+    TokenType.GREATER_EQUAL: number_operator(ge),
+    TokenType.LESS: number_operator(lt),
+    TokenType.LESS_EQUAL: number_operator(le),
+}
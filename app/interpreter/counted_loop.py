@@ -0,0 +1,143 @@
+from operator import gt, ge, lt, le
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.token.token_type import TokenType
+from app.ast.trampoline import trampoline
+from app.interpreter.numbers import NUMBER_TYPES, add, subtract
+
+
+COMPARISONS = {
+    TokenType.LESS: lt,
+    TokenType.LESS_EQUAL: le,
+    TokenType.GREATER: gt,
+    TokenType.GREATER_EQUAL: ge,
+}
+
+STEPS = {
+    TokenType.PLUS: add,
+    TokenType.MINUS: subtract,
+}
+
+
+class CountedLoop:
+    # A While recognized as `while (i <op> bound) { body; i = i +/- step; }`,
+    # which is what Parser.for_statement produces for the usual counted for
+    # loop. The counter is a block-scoped variable in the environment the
+    # While runs in, the bound is a literal or a variable the body never
+    # assigns, and the step is a number literal.
+    __slots__ = ("slot", "compare", "bound", "step", "advance", "body", "scoped")
+
+    def __init__(self, slot, compare, bound, step, advance, body, scoped):
+        self.slot = slot
+        self.compare = compare
+        self.bound = bound
+        self.step = step
+        self.advance = advance
+        self.body = body
+        self.scoped = scoped
+
+
+def match_counted_loop(stmt: While):
+    # Needs the Resolver's depth/slot annotations
+    condition = stmt.condition
+    if not isinstance(condition, Binary) or condition.operator.type not in COMPARISONS:
+        return None
+    counter = condition.left
+    bound = condition.right
+    if not isinstance(counter, Variable) or counter.depth != 0:
+        return None
+    if not (isinstance(bound, Literal) or isinstance(bound, Variable)):
+        return None
+
+    # The body block only holds the loop body and the increment; it must not
+    # declare anything, so one environment can serve every iteration
+    body = stmt.body
+    if not isinstance(body, Block) or body.slot_count != 0 or not body.statements:
+        return None
+    increment = body.statements[-1]
+    if not isinstance(increment, Expression) or not isinstance(increment.expression, Assign):
+        return None
+
+    # Inside a scoped body block the counter is one scope further out
+    depth = 1 if body.scoped else 0
+    assign = increment.expression
+    step = assign.value
+    if assign.depth != depth or assign.slot != counter.slot:
+        return None
+    if not isinstance(step, Binary) or step.operator.type not in STEPS:
+        return None
+    if not isinstance(step.left, Variable) or step.left.depth != depth or step.left.slot != counter.slot:
+        return None
+    if not isinstance(step.right, Literal) or step.right.value.__class__ not in NUMBER_TYPES:
+        return None
+
+    # Checked by name, so an assignment to a shadowing variable with the same
+    # name also keeps the loop on the generic path
+    statements = body.statements[:-1]
+    assigned = AssignedNames().collect(statements)
+    if counter.name.lexeme in assigned:
+        return None
+    if isinstance(bound, Variable) and (bound.name.lexeme in assigned or bound.name.lexeme == counter.name.lexeme):
+        return None
+
+    return CountedLoop(counter.slot, COMPARISONS[condition.operator.type], bound,
+                       step.right.value, STEPS[step.operator.type], statements, body.scoped)
+
+
+class AssignedNames:
+    # Visit methods are generators run by trampoline(), like the Resolver's
+    def __init__(self):
+        self.names = set()
+
+    def collect(self, statements):
+        for statement in statements:
+            if statement is not None:
+                trampoline(statement.accept(self))
+        return self.names
+
+    def visit_block_stmt(self, stmt: Block):
+        for statement in stmt.statements:
+            yield statement.accept(self)
+
+    def visit_var_stmt(self, stmt: Var):
+        if stmt.initializer is not None:
+            yield stmt.initializer.accept(self)
+
+    def visit_if_stmt(self, stmt: If):
+        yield stmt.condition.accept(self)
+        yield stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            yield stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: While):
+        yield stmt.condition.accept(self)
+        yield stmt.body.accept(self)
+
+    def visit_expression_stmt(self, stmt: Expression):
+        yield stmt.expression.accept(self)
+
+    def visit_print_stmt(self, stmt: Print):
+        yield stmt.expression.accept(self)
+
+    def visit_variable_expr(self, expr: Variable):
+        pass
+
+    def visit_assign_expr(self, expr: Assign):
+        self.names.add(expr.name.lexeme)
+        yield expr.value.accept(self)
+
+    def visit_logical_expr(self, expr: Logical):
+        yield expr.left.accept(self)
+        yield expr.right.accept(self)
+
+    def visit_binary_expr(self, expr: Binary):
+        yield expr.left.accept(self)
+        yield expr.right.accept(self)
+
+    def visit_grouping_expr(self, expr: Grouping):
+        yield expr.expression.accept(self)
+
+    def visit_literal_expr(self, expr: Literal):
+        pass
+
+    def visit_unary_expr(self, expr: Unary):
+        yield expr.right.accept(self)
@@ -27,4 +27,25 @@ class Environment:
             self.enclosing.assign(name, value)
             return
             
-        raise RuntimeError(f"Undefined variable '{name.lexeme}'.")
\ No newline at end of file
+        raise RuntimeError(f"Undefined variable '{name.lexeme}'.")
+
+class SlotEnvironment:
+    # Block scope whose variables were assigned slot indexes by the Resolver.
+    # Reads and writes index a list directly instead of hashing the name at
+    # every level of the chain.
+    def __init__(self, enclosing, size):
+        self.values = [None] * size
+        self.enclosing = enclosing
+
+    def ancestor(self, depth):
+        environment = self
+        while depth:
+            environment = environment.enclosing
+            depth -= 1
+        return environment
+
+    def get_at(self, depth, slot):
+        return self.ancestor(depth).values[slot]
+
+    def assign_at(self, depth, slot, value):
+        self.ancestor(depth).values[slot] = value
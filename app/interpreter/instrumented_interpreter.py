@@ -0,0 +1,32 @@
+from app.ast.expr import Expr, Stmt, Variable, Assign
+from app.interpreter.interpreter import Interpreter
+
+
+class InstrumentedInterpreter(Interpreter):
+    # Interpreter that records node visits, environment creation and
+    # variable lookups into a Stats object. Only used when stats are
+    # requested; the plain Interpreter has no counting hooks at all.
+    def __init__(self, stats, output=None):
+        super().__init__(output)
+        self.stats = stats
+        self.visits = stats.node_visits
+
+    def execute(self, stmt: Stmt):
+        self.visits[stmt.__class__] += 1
+        return stmt.accept(self)
+
+    def evaluate(self, expr: Expr):
+        self.visits[expr.__class__] += 1
+        return expr.accept(self)
+
+    def new_environment(self, size):
+        self.stats.environments += 1
+        return super().new_environment(size)
+
+    def visit_variable_expr(self, expr: Variable):
+        self.stats.record_lookup(expr.depth)
+        return super().visit_variable_expr(expr)
+
+    def visit_assign_expr(self, expr: Assign):
+        self.stats.record_lookup(expr.depth)
+        return super().visit_assign_expr(expr)
@@ -1,30 +1,66 @@
-import sys
+from app.runtime.diagnostic import Diagnostic, LoxError, RUNTIME_ERROR
+from app.runtime.budget import string_limit
 from app.ast.expr import Expr, Binary, Grouping, Literal, Unary, Variable, Stmt, Expression, Print, Var, Block, If, While, Assign, Logical
 from app.token.token_type import TokenType
-from app.interpreter.environment import Environment
+from app.interpreter.environment import Environment, SlotEnvironment
+from app.interpreter.values import is_equal, is_truthy, stringify
+from app.interpreter.rope import STRING_TYPES, concat
+from app.interpreter.numbers import NUMBER_TYPES, add, subtract, multiply, negate
+from app.interpreter.stack_evaluator import StackEvaluator, MAX_RECURSIVE_HEIGHT
+from app.output.output_sink import OutputSink
 
 
 class Interpreter:
-    def __init__(self):
+    # Expects statements that have been through the Resolver: block-scoped
+    # variables are read from SlotEnvironment slots, globals by name.
+    # Statements taller than MAX_RECURSIVE_HEIGHT (per the Resolver) run on
+    # the StackEvaluator instead of the recursive walk.
+    def __init__(self, output=None):
         self.globals = Environment()
         self.environment = self.globals
+        self.output = output if output is not None else OutputSink()
+        self.stack_evaluator = StackEvaluator(self)
+        # A Budget whose tick() runs on every loop back-edge, or None, and
+        # its string length limit, taken when a run starts
+        self.budget = None
+        self.string_limit = None
+        # Check-free operations by Binary/Unary node, filled in by
+        # TypeInference under --opt and empty otherwise
+        self.unchecked = {}
 
     def interpret(self, statements):
+        self.string_limit = string_limit(self.budget)
         try:
             for statement in statements:
-                if statement is not None:
+                if statement is None:
+                    continue
+                if statement.height > MAX_RECURSIVE_HEIGHT:
+                    self.stack_evaluator.execute(statement)
+                else:
                     self.execute(statement)
         except RuntimeError as error:
-            print(f"Runtime Error: {error}", file=sys.stderr)
-            sys.exit(1)
+            raise LoxError(Diagnostic(RUNTIME_ERROR, str(error))) from error
+        finally:
+            self.output.flush()
+            # Nodes never run again once their program has
+            self.unchecked.clear()
 
     def execute(self, stmt: Stmt):
         return stmt.accept(self)
 
     def visit_block_stmt(self, stmt: Block):
-        self.execute_block(stmt.statements, Environment(self.environment))
+        if not stmt.scoped:
+            for statement in stmt.statements:
+                self.execute(statement)
+            return None
+        self.execute_block(stmt.statements, self.new_environment(stmt.slot_count))
         return None
 
+    def new_environment(self, size):
+        # Every block scope is created here, so InstrumentedInterpreter can
+        # count them wherever they come from
+        return SlotEnvironment(self.environment, size)
+
     def execute_block(self, statements, environment):
         previous = self.environment
         try:
@@ -44,16 +80,59 @@ class Interpreter:
         return None
 
     def visit_while_stmt(self, stmt: While):
+        if stmt.counted is not None and self.execute_counted_loop(stmt.counted):
+            return None
+        budget = self.budget
         while self.is_truthy(self.evaluate(stmt.condition)):
             self.execute(stmt.body)
+            if budget is not None:
+                budget.tick(self.environment)
         return None
 
+    def execute_counted_loop(self, loop):
+        # Fast path for loops the Resolver matched as counted loops. The
+        # counter lives in a local and is written back to its slot before
+        # each iteration so the body still reads it. The body block declares
+        # nothing: it either has no scope of its own or one environment is
+        # reused for every iteration. Returns False without
+        # running anything if the counter or bound is not a number, so the
+        # generic loop can report the error.
+        environment = self.environment
+        values = environment.values
+        slot = loop.slot
+        counter = values[slot]
+        bound = self.evaluate(loop.bound)
+        if counter.__class__ not in NUMBER_TYPES or bound.__class__ not in NUMBER_TYPES:
+            return False
+
+        compare = loop.compare
+        advance = loop.advance
+        step = loop.step
+        body = loop.body
+        budget = self.budget
+        if loop.scoped:
+            self.environment = self.new_environment(0)
+        try:
+            while compare(counter, bound):
+                for statement in body:
+                    self.execute(statement)
+                counter = advance(counter, step)
+                values[slot] = counter
+                if budget is not None:
+                    budget.tick(self.environment)
+        finally:
+            self.environment = environment
+        return True
+
     def visit_var_stmt(self, stmt: Var):
         value = None
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
-            
-        self.environment.define(stmt.name.lexeme, value)
+
+        if stmt.slot is None:
+            self.environment.define(stmt.name.lexeme, value)
+        else:
+            self.environment.values[stmt.slot] = value
         return None
 
     def visit_expression_stmt(self, stmt: Expression):
@@ -62,18 +141,29 @@ class Interpreter:
 
     def visit_print_stmt(self, stmt: Print):
         value = self.evaluate(stmt.expression)
-        print(self.stringify(value))
+        self.output.write_line(self.stringify(value))
         return None
 
     def evaluate(self, expr: Expr):
         return expr.accept(self)
 
     def visit_variable_expr(self, expr: Variable):
-        return self.environment.get(expr.name)
+        depth = expr.depth
+        if depth is None:
+            return self.globals.get(expr.name)
+
+        environment = self.environment
+        while depth:
+            environment = environment.enclosing
+            depth -= 1
+        return environment.values[expr.slot]
 
     def visit_assign_expr(self, expr: Assign):
         value = self.evaluate(expr.value)
-        self.environment.assign(expr.name, value)
+        if expr.depth is None:
+            self.globals.assign(expr.name, value)
+        else:
+            self.environment.assign_at(expr.depth, expr.slot, value)
         return value
 
     def visit_logical_expr(self, expr: Logical):
@@ -92,9 +182,14 @@ class Interpreter:
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
 
+        if self.unchecked:
+            operation = self.unchecked.get(expr)
+            if operation is not None:
+                return operation(left, right)
+
         if expr.operator.type == TokenType.MINUS:
             self.check_number_operands(expr.operator, left, right)
-            return left - right
+            return subtract(left, right)
         elif expr.operator.type == TokenType.SLASH:
             self.check_number_operands(expr.operator, left, right)
             if right == 0:
@@ -102,17 +197,17 @@ class Interpreter:
             return left / right
         elif expr.operator.type == TokenType.STAR:
             self.check_number_operands(expr.operator, left, right)
-            return left * right
+            return multiply(left, right)
         elif expr.operator.type == TokenType.PLUS:
             # Handle both number addition and string concatenation
-            if isinstance(left, float) and isinstance(right, float):
-                return left + right
-            elif isinstance(left, str) and isinstance(right, str):
-                return left + right
-            elif isinstance(left, float) and isinstance(right, str):
-                return self.stringify(left) + right
-            elif isinstance(left, str) and isinstance(right, float):
-                return left + self.stringify(right)
+            if left.__class__ in NUMBER_TYPES and right.__class__ in NUMBER_TYPES:
+                return add(left, right)
+            elif isinstance(left, STRING_TYPES) and isinstance(right, STRING_TYPES):
+                return concat(left, right, self.string_limit)
+            elif left.__class__ in NUMBER_TYPES and isinstance(right, STRING_TYPES):
+                return concat(self.stringify(left), right, self.string_limit)
+            elif isinstance(left, STRING_TYPES) and right.__class__ in NUMBER_TYPES:
+                return concat(left, self.stringify(right), self.string_limit)
             else:
                 raise RuntimeError("Operands must be two numbers or two strings.")
         elif expr.operator.type == TokenType.GREATER:
@@ -144,9 +239,14 @@ class Interpreter:
     def visit_unary_expr(self, expr: Unary):
         right = self.evaluate(expr.right)
 
+        if self.unchecked:
+            operation = self.unchecked.get(expr)
+            if operation is not None:
+                return operation(right)
+
         if expr.operator.type == TokenType.MINUS:
             self.check_number_operand(expr.operator, right)
-            return -right
+            return negate(right)
         elif expr.operator.type == TokenType.BANG:
             return not self.is_truthy(right)
 
@@ -154,41 +254,20 @@ class Interpreter:
         return None
 
     def check_number_operand(self, operator, operand):
-        if isinstance(operand, float):
+        if operand.__class__ in NUMBER_TYPES:
             return
         raise RuntimeError(f"Operand must be a number.")
 
     def check_number_operands(self, operator, left, right):
-        if isinstance(left, float) and isinstance(right, float):
+        if left.__class__ in NUMBER_TYPES and right.__class__ in NUMBER_TYPES:
             return
         raise RuntimeError(f"Operands must be numbers.")
 
     def is_equal(self, a, b):
-        # Handle nil (None) comparisons
-        if a is None and b is None:
-            return True
-        if a is None:
-            return False
-
-        return a == b
+        return is_equal(a, b)
 
     def is_truthy(self, obj):
-        # False and nil are falsey, everything else is truthy
-        if obj is None:
-            return False
-        if isinstance(obj, bool):
-            return obj
-        return True
+        return is_truthy(obj)
 
     def stringify(self, obj):
-        if obj is None:
-            return "nil"
-
-        # Hack to remove trailing ".0" for integer-valued doubles
-        if isinstance(obj, float):
-            text = str(obj)
-            if text.endswith(".0"):
-                text = text[:-2]
-            return text
-
-        return str(obj)
\ No newline at end of file
+        return stringify(obj)
@@ -0,0 +1,68 @@
+from math import copysign
+
+
+# Lox numbers are doubles. At runtime, integer-valued numbers within
+# +/-2**53 are kept as Python ints instead: every such value is exact as a
+# double, so int arithmetic gives the same result as double arithmetic as
+# long as results outside that range fall back to float. The helpers below
+# handle those edges, plus the one thing an int cannot represent, -0.
+#
+# Number checks compare __class__ against NUMBER_TYPES rather than using
+# isinstance, because bool is a subclass of int.
+
+MAX_EXACT = 2 ** 53
+
+NUMBER_TYPES = (float, int)
+
+
+def number_literal(value):
+    # Also used on constants folded by the Optimizer, which may be negative
+    # or -0.0
+    if not value.is_integer() or not -MAX_EXACT <= value <= MAX_EXACT:
+        return value
+    if value == 0 and copysign(1.0, value) < 0:
+        return value
+    return int(value)
+
+
+def add(a, b):
+    result = a + b
+    if result.__class__ is int and not -MAX_EXACT <= result <= MAX_EXACT:
+        return float(result)
+    return result
+
+
+def subtract(a, b):
+    result = a - b
+    if result.__class__ is int and not -MAX_EXACT <= result <= MAX_EXACT:
+        return float(result)
+    return result
+
+
+def multiply(a, b):
+    result = a * b
+    if result.__class__ is int:
+        if result == 0:
+            # A zero product is negative when exactly one factor is
+            if (a < 0) != (b < 0):
+                return -0.0
+        elif not -MAX_EXACT <= result <= MAX_EXACT:
+            return float(result)
+    return result
+
+
+def negate(a):
+    if a == 0 and a.__class__ is int:
+        return -0.0
+    return -a
+
+
+def format_number(value):
+    if value.__class__ is int:
+        return str(value)
+
+    # Hack to remove trailing ".0" for integer-valued doubles
+    text = str(value)
+    if text.endswith(".0"):
+        text = text[:-2]
+    return text
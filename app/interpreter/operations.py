@@ -0,0 +1,58 @@
+from operator import gt, ge, lt, le
+from app.token.token_type import TokenType
+from app.interpreter.values import is_equal, stringify, divide
+from app.interpreter.rope import STRING_TYPES, concat
+from app.interpreter import numbers
+from app.interpreter.numbers import NUMBER_TYPES
+
+
+def number_operation(operation):
+    def run(left, right):
+        if left.__class__ not in NUMBER_TYPES or right.__class__ not in NUMBER_TYPES:
+            raise RuntimeError("Operands must be numbers.")
+        return operation(left, right)
+    return run
+
+
+def generic_add(string_limit):
+    def run(left, right):
+        if left.__class__ in NUMBER_TYPES:
+            if right.__class__ in NUMBER_TYPES:
+                return numbers.add(left, right)
+            if right.__class__ in STRING_TYPES:
+                return concat(stringify(left), right, string_limit)
+        elif left.__class__ in STRING_TYPES:
+            if right.__class__ in STRING_TYPES:
+                return concat(left, right, string_limit)
+            if right.__class__ in NUMBER_TYPES:
+                return concat(left, stringify(right), string_limit)
+        raise RuntimeError("Operands must be two numbers or two strings.")
+    return run
+
+
+def generic_divide(left, right):
+    if left.__class__ not in NUMBER_TYPES or right.__class__ not in NUMBER_TYPES:
+        raise RuntimeError("Operands must be numbers.")
+    return divide(left, right)
+
+
+def generic_binary(string_limit=None):
+    # Binary operators as functions of their two evaluated operands, with
+    # the same checks and error messages as Interpreter.visit_binary_expr.
+    # Used by the evaluators that dispatch through a table instead of an if
+    # chain; string_limit is what their Budget allows concat() to build.
+    return {
+        TokenType.PLUS: generic_add(string_limit),
+        TokenType.MINUS: number_operation(numbers.subtract),
+        TokenType.STAR: number_operation(numbers.multiply),
+        TokenType.SLASH: generic_divide,
+        TokenType.GREATER: number_operation(gt),
+        TokenType.GREATER_EQUAL: number_operation(ge),
+        TokenType.LESS: number_operation(lt),
+        TokenType.LESS_EQUAL: number_operation(le),
+        TokenType.EQUAL_EQUAL: is_equal,
+        TokenType.BANG_EQUAL: lambda left, right: not is_equal(left, right),
+    }
+
+
+GENERIC_BINARY = generic_binary()
@@ -0,0 +1,26 @@
+from app.ast.expr import Stmt
+from app.interpreter.interpreter import Interpreter
+
+
+class ProfilingInterpreter(Interpreter):
+    # Interpreter that keeps the stack of executing statements where the
+    # Profiler's sampling thread can read it. Only used with --profile.
+    def __init__(self, profiler, output=None):
+        super().__init__(output)
+        self.profiler = profiler
+        self.stack = profiler.stack
+
+    def interpret(self, statements):
+        self.profiler.start()
+        try:
+            super().interpret(statements)
+        finally:
+            self.profiler.stop()
+
+    def execute(self, stmt: Stmt):
+        stack = self.stack
+        stack.append(stmt)
+        try:
+            return stmt.accept(self)
+        finally:
+            stack.pop()
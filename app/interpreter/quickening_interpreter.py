@@ -0,0 +1,172 @@
+from operator import add, sub, mul, gt, ge, lt, le, eq, ne, neg
+from app.ast.expr import Binary, Unary
+from app.token.token_type import TokenType
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.values import is_truthy, divide
+from app.interpreter.rope import Rope, concat
+from app.interpreter.operations import GENERIC_BINARY, generic_binary
+from app.runtime.budget import string_limit
+from app.interpreter import numbers
+from app.interpreter.numbers import NUMBER_TYPES
+
+
+# Number of consecutive evaluations with the same operand type before a
+# node switches to its specialized operation
+QUICKEN_THRESHOLD = 8
+
+
+class Feedback:
+    # What one Binary or Unary node has seen so far: the operand class of
+    # the current run of evaluations, its length, and the specialized
+    # operation once the run is long enough
+    __slots__ = ("quickened", "guard", "count")
+
+    def __init__(self):
+        self.quickened = None
+        self.guard = None
+        self.count = 0
+
+
+class QuickeningInterpreter(Interpreter):
+    # Binary and Unary nodes record the operand types they see. Once a node
+    # has seen the same type QUICKEN_THRESHOLD times in a row it stores a
+    # specialized operation, guarded by a class check on both operands. A
+    # failed guard drops the specialization and the node starts observing
+    # again, so the generic path always decides errors and mixed types.
+    #
+    # The feedback is kept in a table keyed by node rather than on the nodes,
+    # so the AST carries nothing for this unless quickening is used.
+    def __init__(self, output=None):
+        super().__init__(output)
+        self.feedback = {}
+        self.operations = GENERIC_BINARY
+        self.specialized = SPECIALIZED_BINARY
+
+    def interpret(self, statements):
+        limit = string_limit(self.budget)
+        if limit is None:
+            self.operations = GENERIC_BINARY
+            self.specialized = SPECIALIZED_BINARY
+        else:
+            self.operations = generic_binary(limit)
+            self.specialized = limited_binary(limit)
+        # Nodes never run again once their program has, so their feedback
+        # can go with it (a REPL session would otherwise keep every input)
+        try:
+            super().interpret(statements)
+        finally:
+            self.feedback.clear()
+
+    def visit_binary_expr(self, expr: Binary):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+
+        if self.unchecked:
+            operation = self.unchecked.get(expr)
+            if operation is not None:
+                return operation(left, right)
+
+        feedback = self.feedback.get(expr)
+        if feedback is None:
+            feedback = self.feedback[expr] = Feedback()
+        operation = feedback.quickened
+        if operation is not None:
+            guard = feedback.guard
+            if left.__class__ is guard and right.__class__ is guard:
+                return operation(left, right)
+            feedback.quickened = None
+            feedback.count = 0
+
+        kind = left.__class__
+        specialized = self.specialized.get((expr.operator.type, kind)) if right.__class__ is kind else None
+        if specialized is None:
+            feedback.count = 0
+        elif feedback.guard is kind:
+            feedback.count += 1
+            if feedback.count >= QUICKEN_THRESHOLD:
+                feedback.quickened = specialized
+        else:
+            feedback.guard = kind
+            feedback.count = 1
+
+        return self.operations[expr.operator.type](left, right)
+
+    def visit_unary_expr(self, expr: Unary):
+        right = self.evaluate(expr.right)
+
+        if expr.operator.type == TokenType.BANG:
+            return not is_truthy(right)
+
+        if self.unchecked:
+            operation = self.unchecked.get(expr)
+            if operation is not None:
+                return operation(right)
+
+        feedback = self.feedback.get(expr)
+        if feedback is None:
+            feedback = self.feedback[expr] = Feedback()
+        operation = feedback.quickened
+        if operation is not None:
+            if right.__class__ is feedback.guard:
+                return operation(right)
+            feedback.quickened = None
+            feedback.count = 0
+
+        kind = right.__class__
+        if kind not in NUMBER_TYPES:
+            feedback.count = 0
+            raise RuntimeError("Operand must be a number.")
+        if feedback.guard is kind:
+            feedback.count += 1
+            if feedback.count >= QUICKEN_THRESHOLD:
+                feedback.quickened = SPECIALIZED_NEGATE[kind]
+        else:
+            feedback.guard = kind
+            feedback.count = 1
+        return numbers.negate(right)
+
+
+# Operations that are valid without further checks once both operands are
+# known to have the keyed class. Float operations cannot leave the float
+# domain; int ones still handle overflow to float and -0.
+SPECIALIZED_BINARY = {
+    (TokenType.PLUS, float): add,
+    (TokenType.MINUS, float): sub,
+    (TokenType.STAR, float): mul,
+    (TokenType.SLASH, float): divide,
+    (TokenType.GREATER, float): gt,
+    (TokenType.GREATER_EQUAL, float): ge,
+    (TokenType.LESS, float): lt,
+    (TokenType.LESS_EQUAL, float): le,
+    (TokenType.EQUAL_EQUAL, float): eq,
+    (TokenType.BANG_EQUAL, float): ne,
+    (TokenType.PLUS, int): numbers.add,
+    (TokenType.MINUS, int): numbers.subtract,
+    (TokenType.STAR, int): numbers.multiply,
+    (TokenType.SLASH, int): divide,
+    (TokenType.GREATER, int): gt,
+    (TokenType.GREATER_EQUAL, int): ge,
+    (TokenType.LESS, int): lt,
+    (TokenType.LESS_EQUAL, int): le,
+    (TokenType.EQUAL_EQUAL, int): eq,
+    (TokenType.BANG_EQUAL, int): ne,
+    (TokenType.PLUS, str): concat,
+    (TokenType.EQUAL_EQUAL, str): eq,
+    (TokenType.BANG_EQUAL, str): ne,
+    (TokenType.PLUS, Rope): concat,
+    (TokenType.EQUAL_EQUAL, Rope): eq,
+    (TokenType.BANG_EQUAL, Rope): ne,
+}
+
+
+def limited_binary(limit):
+    # SPECIALIZED_BINARY for a run whose Budget limits string length
+    def concatenate(left, right):
+        return concat(left, right, limit)
+    return {**SPECIALIZED_BINARY, (TokenType.PLUS, str): concatenate, (TokenType.PLUS, Rope): concatenate}
+
+
+SPECIALIZED_NEGATE = {
+    float: neg,
+    int: numbers.negate,
+}
@@ -0,0 +1,149 @@
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.ast.trampoline import trampoline
+from app.interpreter.counted_loop import match_counted_loop
+from app.interpreter.numbers import number_literal
+
+
+class Resolver:
+    # Static pass run between Parser.parse() and Interpreter.interpret().
+    #
+    # Every Block gets a slot_count, every Var declared inside a block gets a
+    # slot, and every Variable/Assign that refers to a block-scoped variable
+    # gets the number of scopes to walk out (depth) and the slot to index.
+    # Names not found in any enclosing block are globals and keep depth None.
+    # Integer-valued number literals are converted to ints.
+    #
+    # A block with no Var of its own gets no scope at all (scoped = False),
+    # so depths skip it and the interpreter runs it in the enclosing
+    # environment. Pass elide_scopes=False to give every block a scope.
+    #
+    # Every statement also gets its height (see Stmt). Nothing recurses, so
+    # arbitrarily deep trees resolve: statement visits are generators run
+    # by trampoline() and return the statement's height, and expressions
+    # are walked by resolve_expression().
+    def __init__(self, elide_scopes=True):
+        self.scopes = []
+        # Index in self.scopes of every open scope declaring a name, innermost
+        # last, so a lookup costs the same however deeply blocks are nested
+        self.declared = {}
+        self.elide_scopes = elide_scopes
+
+    def resolve(self, statements):
+        for statement in statements:
+            if statement is not None:
+                trampoline(statement.accept(self))
+        return statements
+
+    def resolve_statements(self, statements):
+        height = 0
+        for statement in statements:
+            height = max(height, (yield statement.accept(self)))
+        return height
+
+    def resolve_local(self, expr, name):
+        indexes = self.declared.get(name.lexeme)
+        if indexes:
+            index = indexes[-1]
+            expr.depth = len(self.scopes) - 1 - index
+            expr.slot = self.scopes[index][name.lexeme]
+            return
+        expr.depth = None
+        expr.slot = None
+
+    def visit_block_stmt(self, stmt: Block):
+        # Var can only appear directly in a block's statement list; nested
+        # blocks get their own scope, and if/while bodies cannot declare
+        if self.elide_scopes and not any(isinstance(statement, Var) for statement in stmt.statements):
+            stmt.scoped = False
+            stmt.slot_count = 0
+            stmt.height = 1 + (yield self.resolve_statements(stmt.statements))
+            return stmt.height
+
+        stmt.scoped = True
+        self.scopes.append({})
+        stmt.height = 1 + (yield self.resolve_statements(stmt.statements))
+        scope = self.scopes.pop()
+        for name in scope:
+            self.declared[name].pop()
+        stmt.slot_count = len(scope)
+        return stmt.height
+
+    def visit_var_stmt(self, stmt: Var):
+        # Resolve the initializer first so `var a = a;` sees the outer `a`
+        stmt.height = 1
+        if stmt.initializer is not None:
+            stmt.height += self.resolve_expression(stmt.initializer)
+
+        if not self.scopes:
+            stmt.slot = None
+            return stmt.height
+
+        # Redeclaring a name in the same block overwrites the existing slot
+        scope = self.scopes[-1]
+        slot = scope.get(stmt.name.lexeme)
+        if slot is None:
+            slot = len(scope)
+            scope[stmt.name.lexeme] = slot
+            self.declared.setdefault(stmt.name.lexeme, []).append(len(self.scopes) - 1)
+        stmt.slot = slot
+        return stmt.height
+
+    def visit_if_stmt(self, stmt: If):
+        height = max(self.resolve_expression(stmt.condition), (yield stmt.then_branch.accept(self)))
+        if stmt.else_branch is not None:
+            height = max(height, (yield stmt.else_branch.accept(self)))
+        stmt.height = 1 + height
+        return stmt.height
+
+    def visit_while_stmt(self, stmt: While):
+        stmt.height = 1 + max(self.resolve_expression(stmt.condition), (yield stmt.body.accept(self)))
+        stmt.counted = match_counted_loop(stmt)
+        return stmt.height
+
+    def visit_expression_stmt(self, stmt: Expression):
+        stmt.height = 1 + self.resolve_expression(stmt.expression)
+        return stmt.height
+
+    def visit_print_stmt(self, stmt: Print):
+        stmt.height = 1 + self.resolve_expression(stmt.expression)
+        return stmt.height
+
+    def resolve_expression(self, expr):
+        # Expressions declare nothing, so their nodes can be resolved in any
+        # order: each expression visit returns its subexpressions, and the
+        # tree is walked one level at a time. Returns the height.
+        height = 0
+        level = [expr]
+        while level:
+            height += 1
+            children = []
+            for expr in level:
+                children.extend(expr.accept(self))
+            level = children
+        return height
+
+    def visit_variable_expr(self, expr: Variable):
+        self.resolve_local(expr, expr.name)
+        return ()
+
+    def visit_assign_expr(self, expr: Assign):
+        self.resolve_local(expr, expr.name)
+        return (expr.value,)
+
+    def visit_logical_expr(self, expr: Logical):
+        return (expr.left, expr.right)
+
+    def visit_binary_expr(self, expr: Binary):
+        return (expr.left, expr.right)
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return (expr.expression,)
+
+    def visit_literal_expr(self, expr: Literal):
+        # Integer-valued number literals run as ints (see numbers.py)
+        if expr.value.__class__ is float:
+            expr.value = number_literal(expr.value)
+        return ()
+
+    def visit_unary_expr(self, expr: Unary):
+        return (expr.right,)
@@ -0,0 +1,73 @@
+from itertools import islice
+from app.runtime.diagnostic import BudgetExceeded
+
+
+# Concatenations shorter than this produce a plain str; Python's own
+# concatenation is faster for small strings
+ROPE_THRESHOLD = 256
+
+
+class Rope:
+    # Lazily concatenated Lox string: the first `count` entries of `parts`.
+    #
+    # Ropes built by repeatedly appending to the same value share one parts
+    # list, and the rope that covers the whole list may append to it in
+    # place, so `s = s + x` in a loop is amortized O(len(x)) instead of
+    # copying s every time. Other ropes over the same list copy their prefix
+    # first. The text is only joined when the string is printed, compared or
+    # hashed, and the result is kept.
+    __slots__ = ("parts", "count", "length", "flat")
+
+    def __init__(self, parts, count, length):
+        self.parts = parts
+        self.count = count
+        self.length = length
+        self.flat = None
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        if self.flat is None:
+            if self.count == len(self.parts):
+                self.flat = "".join(self.parts)
+            else:
+                self.flat = "".join(islice(self.parts, self.count))
+        return self.flat
+
+    def __eq__(self, other):
+        if other.__class__ is Rope or other.__class__ is str:
+            return str(self) == str(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+# Everything a Lox string value can be at runtime
+STRING_TYPES = (str, Rope)
+
+
+def concat(left, right, limit=None):
+    # Lox string concatenation; both operands are str or Rope. limit is the
+    # longest string the run's Budget allows, passed in by the engine, or
+    # None for no limit.
+    length = len(left) + len(right)
+    if limit is not None and length > limit:
+        raise BudgetExceeded(f"String length limit of {limit} exceeded.")
+    if length < ROPE_THRESHOLD:
+        return left + right
+
+    if right.__class__ is Rope:
+        right = str(right)
+    if left.__class__ is not Rope:
+        return Rope([left, right], 2, length)
+
+    parts = left.parts
+    if left.count != len(parts):
+        parts = parts[:left.count]
+    parts.append(right)
+    return Rope(parts, left.count + 1, length)
@@ -0,0 +1,140 @@
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Stmt, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.ast.trampoline import trampoline
+from app.token.token_type import TokenType
+from app.interpreter.values import is_truthy
+from app.interpreter.operations import GENERIC_BINARY, generic_binary
+from app.interpreter.numbers import NUMBER_TYPES, negate
+
+
+# Statements up to this height run on the recursive tree walk, which needs
+# up to five Python frames per level (nested blocks under --stats), so this
+# stays well inside the default recursion limit of 1000. Anything taller
+# runs on the StackEvaluator.
+MAX_RECURSIVE_HEIGHT = 150
+
+
+class StackEvaluator:
+    # Executes statements too deep for the Interpreter's recursive walk.
+    # Visit methods are generators run by trampoline(), so the nesting depth
+    # a program can have is bounded by memory rather than the recursion
+    # limit. It works on the Interpreter's own environments and output, and
+    # hands every nested statement that is shallow enough back to
+    # Interpreter.execute, so only the deep part of a tree pays for the
+    # explicit stack. Counted loops take the generic while path here.
+    def __init__(self, interpreter):
+        self.interpreter = interpreter
+        self.operations = GENERIC_BINARY
+
+    def execute(self, stmt: Stmt):
+        limit = self.interpreter.string_limit
+        self.operations = GENERIC_BINARY if limit is None else generic_binary(limit)
+        return trampoline(self.statement(stmt))
+
+    def statement(self, stmt: Stmt):
+        if stmt.height <= MAX_RECURSIVE_HEIGHT:
+            return self.interpreter.execute(stmt)
+        return stmt.accept(self)
+
+    def visit_block_stmt(self, stmt: Block):
+        interpreter = self.interpreter
+        if not stmt.scoped:
+            for statement in stmt.statements:
+                yield self.statement(statement)
+            return None
+
+        previous = interpreter.environment
+        interpreter.environment = interpreter.new_environment(stmt.slot_count)
+        try:
+            for statement in stmt.statements:
+                yield self.statement(statement)
+        finally:
+            interpreter.environment = previous
+        return None
+
+    def visit_if_stmt(self, stmt: If):
+        if is_truthy((yield stmt.condition.accept(self))):
+            yield self.statement(stmt.then_branch)
+        elif stmt.else_branch is not None:
+            yield self.statement(stmt.else_branch)
+        return None
+
+    def visit_while_stmt(self, stmt: While):
+        interpreter = self.interpreter
+        budget = interpreter.budget
+        while is_truthy((yield stmt.condition.accept(self))):
+            yield self.statement(stmt.body)
+            if budget is not None:
+                budget.tick(interpreter.environment)
+        return None
+
+    def visit_var_stmt(self, stmt: Var):
+        value = None
+        if stmt.initializer is not None:
+            value = yield stmt.initializer.accept(self)
+
+        environment = self.interpreter.environment
+        if stmt.slot is None:
+            environment.define(stmt.name.lexeme, value)
+        else:
+            environment.values[stmt.slot] = value
+        return None
+
+    def visit_expression_stmt(self, stmt: Expression):
+        yield stmt.expression.accept(self)
+        return None
+
+    def visit_print_stmt(self, stmt: Print):
+        value = yield stmt.expression.accept(self)
+        interpreter = self.interpreter
+        interpreter.output.write_line(interpreter.stringify(value))
+        return None
+
+    def visit_variable_expr(self, expr: Variable):
+        return self.interpreter.visit_variable_expr(expr)
+
+    def visit_assign_expr(self, expr: Assign):
+        value = yield expr.value.accept(self)
+        interpreter = self.interpreter
+        if expr.depth is None:
+            interpreter.globals.assign(expr.name, value)
+        else:
+            interpreter.environment.assign_at(expr.depth, expr.slot, value)
+        return value
+
+    def visit_logical_expr(self, expr: Logical):
+        left = yield expr.left.accept(self)
+
+        if expr.operator.type == TokenType.OR:
+            if is_truthy(left):
+                return left
+        elif not is_truthy(left):
+            return left
+
+        return (yield expr.right.accept(self))
+
+    def visit_binary_expr(self, expr: Binary):
+        left = yield expr.left.accept(self)
+        right = yield expr.right.accept(self)
+
+        operation = self.interpreter.unchecked.get(expr)
+        if operation is not None:
+            return operation(left, right)
+        return self.operations[expr.operator.type](left, right)
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return (yield expr.expression.accept(self))
+
+    def visit_literal_expr(self, expr: Literal):
+        return expr.value
+
+    def visit_unary_expr(self, expr: Unary):
+        right = yield expr.right.accept(self)
+
+        operation = self.interpreter.unchecked.get(expr)
+        if operation is not None:
+            return operation(right)
+        if expr.operator.type == TokenType.BANG:
+            return not is_truthy(right)
+        if right.__class__ not in NUMBER_TYPES:
+            raise RuntimeError("Operand must be a number.")
+        return negate(right)
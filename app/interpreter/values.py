@@ -0,0 +1,52 @@
+from app.interpreter.numbers import format_number
+
+
+# Formatted text of the first FORMAT_CACHE_SIZE distinct numbers printed.
+# 3 and 3.0 share an entry, which is fine because they print the same.
+FORMAT_CACHE = {}
+FORMAT_CACHE_SIZE = 4096
+
+
+def is_equal(a, b):
+    # Handle nil (None) comparisons
+    if a is None and b is None:
+        return True
+    if a is None:
+        return False
+
+    return a == b
+
+
+def is_truthy(obj):
+    # False and nil are falsey, everything else is truthy
+    if obj is None:
+        return False
+    if isinstance(obj, bool):
+        return obj
+    return True
+
+
+def stringify(obj):
+    if obj is None:
+        return "nil"
+
+    if obj.__class__ is int or obj.__class__ is float:
+        # Zero is never cached: 0 and -0.0 are equal keys but print
+        # differently
+        if obj:
+            text = FORMAT_CACHE.get(obj)
+            if text is None:
+                text = format_number(obj)
+                if len(FORMAT_CACHE) < FORMAT_CACHE_SIZE:
+                    FORMAT_CACHE[obj] = text
+            return text
+        return format_number(obj)
+
+    return str(obj)
+
+
+def divide(a, b):
+    # Number division once both operands are known to be numbers
+    if b == 0:
+        raise RuntimeError("Division by zero")
+    return a / b
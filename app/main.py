@@ -1,47 +1,176 @@
+import os
 import sys
-from app.scanner.scanner import Scanner
-from app.parser.parser import Parser
-from app.ast.ast_printer import AstPrinter
-from app.interpreter.interpreter import Interpreter
+import time
+from collections import Counter
+from app.runtime.lox_runtime import LoxRuntime, COMMANDS, STATS_CONFLICT
+from app.runtime.repl import Repl, prompt_lines
+from app.runtime.batch_runner import BatchRunner, find_jobs, read_manifest, OK
+from app.output.output_sink import OutputSink
+from app.stats.stats import Stats
+from app.profiler.profiler import Profiler, DEFAULT_INTERVAL
+
+
+DEFAULT_PROFILE_OUTPUT = "profile.folded"
+
+
+def parse_args(argv):
+    # Options look like --name or --name=value and may appear anywhere after the command
+    arguments = []
+    options = {}
+    for arg in argv:
+        if arg.startswith("--"):
+            name, _, value = arg[2:].partition("=")
+            options[name] = value if value else True
+        else:
+            arguments.append(arg)
+    return arguments, options
 
 
 def main():
-    if len(sys.argv) < 3:
+    # A thin wrapper over LoxRuntime: check the arguments, run the file with
+    # output going to stdout, print any diagnostics to stderr
+    arguments, options = parse_args(sys.argv[1:])
+    if arguments == ["repl"]:
+        repl(options)
+        return
+    if arguments[:1] == ["batch"]:
+        batch(arguments[1:], options)
+        return
+    if len(arguments) < 2:
         print("Usage: ./your_program.sh tokenize <filename>", file=sys.stderr)
         exit(1)
 
-    command = sys.argv[1]
-    filename = sys.argv[2]
+    command = arguments[0]
+    filename = arguments[1]
 
-    if command != "tokenize" and command != "parse" and command != "ast-print" and command != "interpret":
+    if command not in COMMANDS:
         print(f"Unknown command: {command}", file=sys.stderr)
         exit(1)
 
+    # Running a file from the command line caches its parse by default; the
+    # REPL, batch workers and embedders only cache when asked to
+    options.setdefault("cache", True)
+
+    try:
+        runtime = LoxRuntime(options, sys.stdout)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        exit(1)
+
+    profiler = None
+    if options.get("profile"):
+        if command != "interpret" or options.get("compile") is not None:
+            print("--profile requires the interpret command without --compile", file=sys.stderr)
+            exit(1)
+        interval = options.get("profile-interval", DEFAULT_INTERVAL * 1000)
+        try:
+            interval = float(interval) / 1000
+        except ValueError:
+            interval = 0
+        if not interval > 0:
+            print(f"Invalid profile interval: {options.get('profile-interval')}", file=sys.stderr)
+            exit(1)
+        profiler = Profiler(interval)
+
+    # --stats writes the JSON report to stderr, --stats=<path> to a file
+    stats_target = options.get("stats")
+    if stats_target and (options.get("compile") is not None or options.get("quicken") or profiler is not None):
+        print(STATS_CONFLICT, file=sys.stderr)
+        exit(1)
+
     with open(filename) as file:
         file_contents = file.read()
-    
-    scanner = Scanner(file_contents)
-    tokens = scanner.scan_tokens()
-    
-    if command == "tokenize":
-        for token in tokens:
-            print(token)
-    elif command == "parse" or command == "ast-print" or command == "interpret":
-        parser = Parser(tokens)
-        statements = parser.parse()
-        if command == "parse":
-            for statement in statements:
-                print(statement)
-        elif command == "ast-print":
-            # For simplicity, we'll just print the first statement's expression
-            if statements:
-                printer = AstPrinter()
-                if hasattr(statements[0], 'expression'):
-                    print(printer.print(statements[0].expression))
-        else:
-            interpreter = Interpreter()
-            interpreter.interpret(statements)
+
+    stats = Stats() if stats_target else None
+
+    try:
+        result = runtime.run(file_contents, command, stats, profiler)
+        for diagnostic in result.diagnostics:
+            print(diagnostic, file=sys.stderr)
+    finally:
+        if stats is not None:
+            write_stats(stats, stats_target)
+        if profiler is not None:
+            write_profile(profiler, file_contents, options.get("profile"))
+    if not result.ok:
+        sys.exit(result.exit_code)
+
+
+def repl(options):
+    try:
+        runtime = LoxRuntime(options, sys.stdout)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        exit(1)
+    session = Repl(runtime, sys.stderr)
+    if sys.stdin.isatty():
+        session.run(prompt_lines(session))
+    else:
+        session.run(sys.stdin)
+
+
+def batch(paths, options):
+    # One JSON line per job on stdout, in job order, and a summary on stderr.
+    # Exits 1 unless every job succeeded.
+    workers = options.get("workers", os.cpu_count() or 1)
+    if not str(workers).isdigit() or int(workers) < 1:
+        print(f"Invalid worker count: {workers}", file=sys.stderr)
+        exit(1)
+
+    timeout = options.get("job-timeout")
+    if timeout is not None:
+        try:
+            timeout = float(timeout) / 1000
+        except ValueError:
+            timeout = 0
+        if not timeout > 0:
+            print(f"Invalid job timeout: {options.get('job-timeout')}", file=sys.stderr)
+            exit(1)
+
+    # Checks the remaining options before any worker starts
+    try:
+        LoxRuntime(options)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        exit(1)
+
+    jobs = find_jobs(paths)
+    if options.get("manifest"):
+        jobs.extend(read_manifest(options["manifest"]))
+    if not jobs:
+        print("Usage: ./your_program.sh batch <file or directory>... [--manifest=<file>]", file=sys.stderr)
+        exit(1)
+
+    output = OutputSink()
+    statuses = Counter()
+    start = time.perf_counter()
+    for result in BatchRunner(options, int(workers), timeout).run(jobs):
+        output.write_line(result.to_json())
+        statuses[result.status] += 1
+    output.flush()
+
+    counts = ", ".join(f"{count} {status}" for status, count in statuses.most_common())
+    print(f"{len(jobs)} jobs in {time.perf_counter() - start:.2f}s: {counts}", file=sys.stderr)
+    if statuses[OK] != len(jobs):
+        sys.exit(1)
+
+
+def write_stats(stats, target):
+    if target is True:
+        print(stats.to_json(), file=sys.stderr)
+    else:
+        with open(target, "w") as file:
+            file.write(stats.to_json() + "\n")
+
+
+def write_profile(profiler, source, target):
+    # Hotspot table on stderr, collapsed stacks for flamegraph tools in a file
+    print(profiler.hotspots(source), file=sys.stderr)
+    if target is True:
+        target = DEFAULT_PROFILE_OUTPUT
+    with open(target, "w") as file:
+        file.write(profiler.collapsed())
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
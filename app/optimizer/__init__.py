@@ -0,0 +1 @@
+# Optimizer module for the Lox interpreter
\ No newline at end of file
@@ -0,0 +1,138 @@
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.token.token_type import TokenType
+from app.ast.trampoline import trampoline
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.values import is_truthy
+from app.runtime.diagnostic import BudgetExceeded
+
+
+class Optimizer:
+    # AST-to-AST pass run after parsing and before the Resolver.
+    #
+    # Constant subexpressions are evaluated with the Interpreter itself, so
+    # folding follows the runtime semantics exactly. When evaluation raises
+    # (e.g. `1 / 0`) the node is left as it is and the error is reported at
+    # runtime, when the statement actually executes.
+    #
+    # Visit methods are generators run by trampoline(), so deeply nested
+    # trees are optimized without recursion. string_limit is the run's
+    # Budget limit, which a folded string must not go over either.
+    def __init__(self, string_limit=None):
+        self.evaluator = Interpreter()
+        self.evaluator.string_limit = string_limit
+
+    def optimize(self, statements):
+        return trampoline(self.optimize_statements(statements))
+
+    def optimize_statements(self, statements):
+        optimized = []
+        for statement in statements:
+            if statement is None:
+                continue
+            statement = yield statement.accept(self)
+            if statement is None:
+                continue
+            # A block that declares nothing only costs an environment
+            if isinstance(statement, Block) and not self.declares(statement):
+                optimized.extend(statement.statements)
+            else:
+                optimized.append(statement)
+        return optimized
+
+    def optimize_branch(self, stmt):
+        # If branches and loop bodies must stay a single statement
+        stmt = yield stmt.accept(self)
+        if stmt is None:
+            return Block([])
+        if isinstance(stmt, Block) and len(stmt.statements) == 1 and not self.declares(stmt):
+            return stmt.statements[0]
+        return stmt
+
+    def declares(self, block: Block):
+        return any(isinstance(statement, Var) for statement in block.statements)
+
+    def fold(self, expr):
+        try:
+            return Literal(self.evaluator.evaluate(expr))
+        except (RuntimeError, BudgetExceeded):
+            # Includes strings over the run's length limit
+            return expr
+
+    def visit_block_stmt(self, stmt: Block):
+        stmt.statements = yield self.optimize_statements(stmt.statements)
+        return stmt
+
+    def visit_if_stmt(self, stmt: If):
+        stmt.condition = yield stmt.condition.accept(self)
+
+        if isinstance(stmt.condition, Literal):
+            if is_truthy(stmt.condition.value):
+                return (yield stmt.then_branch.accept(self))
+            if stmt.else_branch is not None:
+                return (yield stmt.else_branch.accept(self))
+            return None
+
+        stmt.then_branch = yield self.optimize_branch(stmt.then_branch)
+        if stmt.else_branch is not None:
+            stmt.else_branch = yield self.optimize_branch(stmt.else_branch)
+        return stmt
+
+    def visit_while_stmt(self, stmt: While):
+        stmt.condition = yield stmt.condition.accept(self)
+
+        if isinstance(stmt.condition, Literal) and not is_truthy(stmt.condition.value):
+            return None
+
+        stmt.body = yield self.optimize_branch(stmt.body)
+        return stmt
+
+    def visit_var_stmt(self, stmt: Var):
+        if stmt.initializer is not None:
+            stmt.initializer = yield stmt.initializer.accept(self)
+        return stmt
+
+    def visit_expression_stmt(self, stmt: Expression):
+        stmt.expression = yield stmt.expression.accept(self)
+        return stmt
+
+    def visit_print_stmt(self, stmt: Print):
+        stmt.expression = yield stmt.expression.accept(self)
+        return stmt
+
+    def visit_variable_expr(self, expr: Variable):
+        return expr
+
+    def visit_assign_expr(self, expr: Assign):
+        expr.value = yield expr.value.accept(self)
+        return expr
+
+    def visit_logical_expr(self, expr: Logical):
+        expr.left = yield expr.left.accept(self)
+        expr.right = yield expr.right.accept(self)
+
+        if isinstance(expr.left, Literal):
+            if expr.operator.type == TokenType.OR:
+                return expr.left if is_truthy(expr.left.value) else expr.right
+            return expr.right if is_truthy(expr.left.value) else expr.left
+        return expr
+
+    def visit_binary_expr(self, expr: Binary):
+        expr.left = yield expr.left.accept(self)
+        expr.right = yield expr.right.accept(self)
+
+        if isinstance(expr.left, Literal) and isinstance(expr.right, Literal):
+            return self.fold(expr)
+        return expr
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return (yield expr.expression.accept(self))
+
+    def visit_literal_expr(self, expr: Literal):
+        return expr
+
+    def visit_unary_expr(self, expr: Unary):
+        expr.right = yield expr.right.accept(self)
+
+        if isinstance(expr.right, Literal):
+            return self.fold(expr)
+        return expr
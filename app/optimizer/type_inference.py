@@ -0,0 +1,169 @@
+from operator import gt, ge, lt, le, eq, ne
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.token.token_type import TokenType
+from app.ast.trampoline import trampoline
+from app.interpreter.values import divide, stringify
+from app.interpreter.rope import STRING_TYPES, concat
+from app.interpreter.numbers import NUMBER_TYPES, add, subtract, multiply, negate
+
+
+# Static types: a value that is definitely a number, definitely a string, or
+# anything else (booleans, nil, or not known)
+NUMBER = "number"
+STRING = "string"
+UNKNOWN = "unknown"
+
+# Operators whose result is a number whenever they do not raise
+NUMBER_RESULTS = (TokenType.MINUS, TokenType.STAR, TokenType.SLASH)
+
+
+def join(a, b):
+    return a if a == b else UNKNOWN
+
+
+class TypeInference:
+    # Annotation pass run after the Resolver under --opt.
+    #
+    # A Binary/Unary whose operand types make the runtime check redundant
+    # gets an entry in `unchecked`, a table from node to check-free
+    # operation. It is the table of the interpreter that runs the program,
+    # which calls that operation instead of the checked path; nodes carry
+    # nothing for this, so runs without --opt pay nothing for it.
+    # Variables are typed by name: a name's type is the join of every value
+    # assigned to it so far, across all scopes, iterated to a fixpoint so
+    # loop-carried assignments are seen. Top-level statements run in order,
+    # so statements inferred one at a time only need the assignments of
+    # earlier statements, and the pass works on a streamed program too.
+    # Visit methods are generators run by trampoline().
+    def __init__(self, unchecked=None, string_limit=None):
+        self.names = {}
+        self.unchecked = {} if unchecked is None else unchecked
+        # Check-free string concatenation still has to respect the limit
+        # of the run's Budget
+        self.string_limit = string_limit
+        self.operations = UNCHECKED_BINARY if string_limit is None else unchecked_binary(string_limit)
+        self.changed = False
+
+    def infer(self, statements):
+        while True:
+            self.changed = False
+            for statement in statements:
+                if statement is not None:
+                    trampoline(statement.accept(self))
+            if not self.changed:
+                return statements
+
+    def assign(self, name, type):
+        # Names start out unassigned (None) and only ever widen
+        current = self.names.get(name.lexeme)
+        widened = type if current is None else join(current, type)
+        if widened != current:
+            self.names[name.lexeme] = widened
+            self.changed = True
+
+    def visit_block_stmt(self, stmt: Block):
+        for statement in stmt.statements:
+            yield statement.accept(self)
+
+    def visit_var_stmt(self, stmt: Var):
+        if stmt.initializer is None:
+            self.assign(stmt.name, UNKNOWN)
+        else:
+            self.assign(stmt.name, (yield stmt.initializer.accept(self)))
+
+    def visit_if_stmt(self, stmt: If):
+        yield stmt.condition.accept(self)
+        yield stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            yield stmt.else_branch.accept(self)
+
+    def visit_while_stmt(self, stmt: While):
+        yield stmt.condition.accept(self)
+        yield stmt.body.accept(self)
+
+    def visit_expression_stmt(self, stmt: Expression):
+        yield stmt.expression.accept(self)
+
+    def visit_print_stmt(self, stmt: Print):
+        yield stmt.expression.accept(self)
+
+    def visit_variable_expr(self, expr: Variable):
+        # A name with no assignment yet can only be read as an error
+        return self.names.get(expr.name.lexeme) or UNKNOWN
+
+    def visit_assign_expr(self, expr: Assign):
+        type = yield expr.value.accept(self)
+        self.assign(expr.name, type)
+        return type
+
+    def visit_logical_expr(self, expr: Logical):
+        return join((yield expr.left.accept(self)), (yield expr.right.accept(self)))
+
+    def visit_binary_expr(self, expr: Binary):
+        left = yield expr.left.accept(self)
+        right = yield expr.right.accept(self)
+        operator = expr.operator.type
+
+        if operator in NUMBER_RESULTS:
+            type = NUMBER
+        elif operator == TokenType.PLUS:
+            if left == NUMBER and right == NUMBER:
+                type = NUMBER
+            elif STRING in (left, right):
+                type = STRING
+            else:
+                type = UNKNOWN
+        else:
+            type = UNKNOWN
+
+        self.record(expr, self.operations.get((operator, left, right)))
+        return type
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return (yield expr.expression.accept(self))
+
+    def visit_literal_expr(self, expr: Literal):
+        if expr.value.__class__ in NUMBER_TYPES:
+            return NUMBER
+        if expr.value.__class__ in STRING_TYPES:
+            return STRING
+        return UNKNOWN
+
+    def visit_unary_expr(self, expr: Unary):
+        right = yield expr.right.accept(self)
+        if expr.operator.type == TokenType.MINUS:
+            self.record(expr, negate if right == NUMBER else None)
+            return NUMBER
+        return UNKNOWN
+
+    def record(self, expr, operation):
+        # A later round of the fixpoint may widen an operand and take the
+        # operation away again
+        if operation is None:
+            self.unchecked.pop(expr, None)
+        else:
+            self.unchecked[expr] = operation
+
+
+def unchecked_binary(string_limit=None):
+    # Check-free operations, keyed by operator and the two operand types
+    return {
+        (TokenType.PLUS, NUMBER, NUMBER): add,
+        (TokenType.MINUS, NUMBER, NUMBER): subtract,
+        (TokenType.STAR, NUMBER, NUMBER): multiply,
+        (TokenType.SLASH, NUMBER, NUMBER): divide,
+        (TokenType.GREATER, NUMBER, NUMBER): gt,
+        (TokenType.GREATER_EQUAL, NUMBER, NUMBER): ge,
+        (TokenType.LESS, NUMBER, NUMBER): lt,
+        (TokenType.LESS_EQUAL, NUMBER, NUMBER): le,
+        (TokenType.EQUAL_EQUAL, NUMBER, NUMBER): eq,
+        (TokenType.BANG_EQUAL, NUMBER, NUMBER): ne,
+        (TokenType.PLUS, STRING, STRING): lambda left, right: concat(left, right, string_limit),
+        (TokenType.EQUAL_EQUAL, STRING, STRING): eq,
+        (TokenType.BANG_EQUAL, STRING, STRING): ne,
+        (TokenType.PLUS, NUMBER, STRING): lambda left, right: concat(stringify(left), right, string_limit),
+        (TokenType.PLUS, STRING, NUMBER): lambda left, right: concat(left, stringify(right), string_limit),
+    }
+
+
+UNCHECKED_BINARY = unchecked_binary()
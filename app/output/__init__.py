@@ -0,0 +1 @@
+# Output module for the Lox interpreter
\ No newline at end of file
@@ -0,0 +1,39 @@
+import sys
+
+
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+class OutputSink:
+    # Collects output lines and writes them to the stream in large chunks.
+    #
+    # Calling print() once per Lox print statement costs a write and a flush
+    # check per line, which dominates print-heavy scripts when stdout is a
+    # pipe. Lines are buffered until buffer_size characters are pending, and
+    # callers flush before reporting errors and on exit. line_buffered writes
+    # and flushes every line, for interactive use.
+    def __init__(self, stream=None, buffer_size=DEFAULT_BUFFER_SIZE, line_buffered=False):
+        self.stream = stream if stream is not None else sys.stdout
+        self.buffer_size = buffer_size
+        self.line_buffered = line_buffered
+        self.lines = []
+        self.pending = 0
+
+    def write_line(self, text):
+        if self.line_buffered:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+            return
+
+        self.lines.append(text)
+        self.pending += len(text) + 1
+        if self.pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if self.lines:
+            self.lines.append("")
+            self.stream.write("\n".join(self.lines))
+            self.lines = []
+            self.pending = 0
+        self.stream.flush()
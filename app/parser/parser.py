@@ -1,4 +1,4 @@
-import sys
+from app.runtime.diagnostic import Diagnostic, LoxError, PARSE_ERROR
 from app.token.token_type import TokenType
 from app.token.token import Token
 from app.ast.expr import Expr, Binary, Grouping, Literal, Unary, Variable, Stmt, Expression, Print, Var, Block, If, While, Assign, Logical
@@ -10,12 +10,15 @@ class Parser:
         self.current = 0
 
     def parse(self):
-        statements = []
+        return list(self.declarations())
+
+    def declarations(self):
+        # Yields top-level declarations one at a time, so a streaming caller
+        # can execute each one before the rest of the file is parsed.
         while not self.is_at_end():
             stmt = self.declaration()
             if stmt is not None:
-                statements.append(stmt)
-        return statements
+                yield stmt
 
     def declaration(self):
         try:
@@ -34,9 +37,19 @@ class Parser:
             initializer = self.expression()
             
         self.consume(TokenType.SEMICOLON, "Expect ';' after variable declaration.")
-        return Var(name, initializer)
+        stmt = Var(name, initializer)
+        stmt.line = name.line
+        return stmt
 
     def statement(self):
+        # Record the line the statement starts on (used by the profiler)
+        line = self.peek().line
+        stmt = self.statement_node()
+        if stmt.line is None:
+            stmt.line = line
+        return stmt
+
+    def statement_node(self):
         if self.match(TokenType.IF):
             return self.if_statement()
         if self.match(TokenType.WHILE):
@@ -70,6 +83,12 @@ class Parser:
         return While(condition, body)
 
     def for_statement(self):
+        keyword, initializer, condition, increment = self.for_clauses()
+        body = self.statement()
+        return self.desugar_for(keyword, initializer, condition, increment, body)
+
+    def for_clauses(self):
+        keyword = self.previous()
         self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'for'.")
 
         initializer = None
@@ -89,16 +108,20 @@ class Parser:
         if not self.check(TokenType.RIGHT_PAREN):
             increment = self.expression()
         self.consume(TokenType.RIGHT_PAREN, "Expect ')' after for clauses.")
-        
-        body = self.statement()
-        
+        return keyword, initializer, condition, increment
+
+    def desugar_for(self, keyword, initializer, condition, increment, body):
         # Desugar for loop to while loop
         if increment is not None:
-            body = Block([body, Expression(increment)])
+            step = Expression(increment)
+            step.line = keyword.line
+            body = Block([body, step])
+            body.line = keyword.line
             
         if condition is None:
             condition = Literal(True)
         body = While(condition, body)
+        body.line = keyword.line
         
         if initializer is not None:
             body = Block([initializer, body])
@@ -270,10 +293,10 @@ class Parser:
     @staticmethod
     def error(token, message):
         if token.type == TokenType.EOF:
-            print(f"[line {token.line}] Error at end: {message}", file=sys.stderr)
+            where = " at end"
         else:
-            print(f"[line {token.line}] Error at '{token.lexeme}': {message}", file=sys.stderr)
-        sys.exit(1)
+            where = f" at '{token.lexeme}'"
+        raise LoxError(Diagnostic(PARSE_ERROR, message, token.line, where))
 
     def synchronize(self):
         self.advance()
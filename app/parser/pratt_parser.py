@@ -0,0 +1,219 @@
+from app.token.token_type import TokenType
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Assign, Logical, Block, If, While
+from app.ast.trampoline import trampoline
+from app.parser.parser import Parser, ParseError
+
+
+# Binding power of each binary operator, lowest first. All of them are
+# left-associative.
+BINARY_PRECEDENCE = {
+    TokenType.OR: 1,
+    TokenType.AND: 2,
+    TokenType.BANG_EQUAL: 3,
+    TokenType.EQUAL_EQUAL: 3,
+    TokenType.GREATER: 4,
+    TokenType.GREATER_EQUAL: 4,
+    TokenType.LESS: 4,
+    TokenType.LESS_EQUAL: 4,
+    TokenType.MINUS: 5,
+    TokenType.PLUS: 5,
+    TokenType.SLASH: 6,
+    TokenType.STAR: 6,
+}
+
+LOGICAL_OPERATORS = (TokenType.OR, TokenType.AND)
+
+PREFIX_OPERATORS = (TokenType.BANG, TokenType.MINUS)
+
+LITERAL_VALUES = {
+    TokenType.FALSE: False,
+    TokenType.TRUE: True,
+    TokenType.NIL: None,
+}
+
+# Kinds of entries on the operator stack
+PREFIX, BINARY, GROUP, ASSIGN = range(4)
+
+
+def literal_rule(token):
+    return Literal(LITERAL_VALUES[token.type])
+
+
+def value_rule(token):
+    return Literal(token.literal)
+
+
+def variable_rule(token):
+    return Variable(token)
+
+
+PRIMARY_RULES = {
+    TokenType.FALSE: literal_rule,
+    TokenType.TRUE: literal_rule,
+    TokenType.NIL: literal_rule,
+    TokenType.NUMBER: value_rule,
+    TokenType.STRING: value_rule,
+    TokenType.IDENTIFIER: variable_rule,
+}
+
+
+class PrattParser(Parser):
+    # Parser that needs no recursion, so the nesting depth of a program is
+    # limited by memory rather than the recursion limit. The AST and the
+    # error messages (and the tokens they are reported at) are the same as
+    # Parser's.
+    #
+    # Expressions are parsed by one operator-precedence loop over explicit
+    # operand and operator stacks, driven by BINARY_PRECEDENCE and
+    # PRIMARY_RULES. Statements that contain statements are generators run
+    # by trampoline(); the rest are inherited from Parser.
+    #
+    # Tokens are read as self.tokens[self.current] directly, so this works
+    # on token lists, TokenBuffer and TokenStream alike.
+
+    def declaration(self):
+        try:
+            return trampoline(self.declaration_rule())
+        except ParseError:
+            self.synchronize()
+            return None
+
+    def statement(self):
+        return trampoline(self.statement_rule())
+
+    def declaration_rule(self):
+        if self.match(TokenType.VAR):
+            return self.var_declaration()
+        return (yield self.statement_rule())
+
+    def statement_rule(self):
+        # Record the line the statement starts on (used by the profiler)
+        line = self.peek().line
+        if self.match(TokenType.IF):
+            stmt = yield self.if_rule()
+        elif self.match(TokenType.WHILE):
+            stmt = yield self.while_rule()
+        elif self.match(TokenType.FOR):
+            stmt = yield self.for_rule()
+        elif self.match(TokenType.PRINT):
+            stmt = self.print_statement()
+        elif self.match(TokenType.LEFT_BRACE):
+            stmt = Block((yield self.block_rule()))
+        else:
+            stmt = self.expression_statement()
+        if stmt.line is None:
+            stmt.line = line
+        return stmt
+
+    def if_rule(self):
+        self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'if'.")
+        condition = self.or_expr()
+        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after if condition.")
+
+        then_branch = yield self.statement_rule()
+        else_branch = None
+        if self.match(TokenType.ELSE):
+            else_branch = yield self.statement_rule()
+
+        return If(condition, then_branch, else_branch)
+
+    def while_rule(self):
+        self.consume(TokenType.LEFT_PAREN, "Expect '(' after 'while'.")
+        condition = self.or_expr()
+        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after condition.")
+        body = yield self.statement_rule()
+
+        return While(condition, body)
+
+    def for_rule(self):
+        keyword, initializer, condition, increment = self.for_clauses()
+        body = yield self.statement_rule()
+        return self.desugar_for(keyword, initializer, condition, increment, body)
+
+    def block_rule(self):
+        statements = []
+
+        while not self.check(TokenType.RIGHT_BRACE) and not self.is_at_end():
+            stmt = yield self.declaration_rule()
+            if stmt is not None:
+                statements.append(stmt)
+
+        self.consume(TokenType.RIGHT_BRACE, "Expect '}' after block.")
+        return statements
+
+    def expression(self):
+        return self.parse_expression(True)
+
+    def or_expr(self):
+        # if/while conditions: an `=` at the top level ends the expression
+        return self.parse_expression(False)
+
+    def parse_expression(self, allow_assignment):
+        tokens = self.tokens
+        # Left operands of the BINARY entries on the operator stack
+        operands = []
+        # (PREFIX, token), (GROUP, token), (BINARY, token, precedence) or
+        # (ASSIGN, equals token, target)
+        operators = []
+
+        while True:
+            # An operand: prefix operators and open parentheses, then a primary
+            token = tokens[self.current]
+            while token.type in PREFIX_OPERATORS or token.type == TokenType.LEFT_PAREN:
+                operators.append((PREFIX if token.type != TokenType.LEFT_PAREN else GROUP, token))
+                self.current += 1
+                token = tokens[self.current]
+            rule = PRIMARY_RULES.get(token.type)
+            if rule is None:
+                raise self.error(token, "Expect expression.")
+            self.current += 1
+            operand = rule(token)
+
+            # What follows an operand: a binary operator starts the next
+            # operand; anything else closes the innermost group or ends the
+            # expression, after the operators it bounds are applied
+            while True:
+                while operators and operators[-1][0] == PREFIX:
+                    operand = Unary(operators.pop()[1], operand)
+
+                token = tokens[self.current]
+                precedence = BINARY_PRECEDENCE.get(token.type)
+                if precedence is not None:
+                    operand = self.reduce_binary(operands, operators, operand, precedence)
+                    operands.append(operand)
+                    operators.append((BINARY, token, precedence))
+                    self.current += 1
+                    break
+
+                operand = self.reduce_binary(operands, operators, operand, 0)
+                if token.type == TokenType.EQUAL and (operators or allow_assignment):
+                    # The whole operand so far is the target; it is checked
+                    # once the value has been parsed, as Parser does
+                    operators.append((ASSIGN, token, operand))
+                    self.current += 1
+                    break
+
+                while operators and operators[-1][0] == ASSIGN:
+                    _, equals, target = operators.pop()
+                    if not isinstance(target, Variable):
+                        self.error(equals, "Invalid assignment target.")
+                    operand = Assign(target.name, operand)
+
+                if not operators:
+                    return operand
+                # Only a GROUP can be left on top here
+                operators.pop()
+                self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+                operand = Grouping(operand)
+
+    def reduce_binary(self, operands, operators, right, precedence):
+        # Applies the pending binary operators that bind at least as tightly
+        # as precedence, which makes every level left-associative
+        while operators and operators[-1][0] == BINARY and operators[-1][2] >= precedence:
+            operator = operators.pop()[1]
+            left = operands.pop()
+            if operator.type in LOGICAL_OPERATORS:
+                right = Logical(left, operator, right)
+            else:
+                right = Binary(left, operator, right)
+        return right
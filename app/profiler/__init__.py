@@ -0,0 +1 @@
+# Profiler module for the Lox interpreter
\ No newline at end of file
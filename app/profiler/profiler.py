@@ -0,0 +1,88 @@
+import sys
+import threading
+from collections import Counter
+
+
+DEFAULT_INTERVAL = 0.001
+
+
+class Profiler:
+    # Samples the statement stack of a ProfilingInterpreter from a
+    # background thread. Each sample is the tuple of statement nodes being
+    # executed, outermost first, so Block/While/If nesting becomes the stack.
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples = Counter()
+        self.stack = []
+        self.stopped = threading.Event()
+        self.thread = None
+        self.switch_interval = None
+
+    def start(self):
+        # The sampler can only run when the interpreter thread releases the
+        # GIL, so shorten the switch interval to match the sampling rate
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.switch_interval, self.interval))
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+        sys.setswitchinterval(self.switch_interval)
+
+    def sample(self):
+        stack = self.stack
+        samples = self.samples
+        while not self.stopped.wait(self.interval):
+            current = tuple(stack)
+            if current:
+                samples[current] += 1
+
+    def total(self):
+        return sum(self.samples.values())
+
+    def line_counts(self):
+        # Self samples count the innermost statement's line; total samples
+        # count every line on the stack once
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.samples.items():
+            lines = [stmt.line for stmt in stack if stmt.line is not None]
+            if not lines:
+                continue
+            self_counts[lines[-1]] += count
+            for line in set(lines):
+                total_counts[line] += count
+        return self_counts, total_counts
+
+    def hotspots(self, source, limit=20):
+        total = self.total()
+        lines = source.splitlines()
+        self_counts, total_counts = self.line_counts()
+
+        rows = [f"{total} samples every {self.interval * 1000:g} ms",
+                f"{'line':>6} {'self%':>7} {'total%':>7} {'samples':>8}  source"]
+        for line, count in self_counts.most_common(limit):
+            text = lines[line - 1].strip() if 0 < line <= len(lines) else ""
+            rows.append(f"{line:>6} {100 * count / total:>7.1f} {100 * total_counts[line] / total:>7.1f} {count:>8}  {text}")
+        return "\n".join(rows)
+
+    def collapsed(self):
+        # One "frame;frame;frame count" line per distinct stack, the format
+        # read by flamegraph.pl, speedscope and inferno
+        merged = Counter()
+        for stack, count in self.samples.items():
+            frames = ["script"] + [frame_name(stmt) for stmt in stack]
+            merged[";".join(frames)] += count
+        return "".join(f"{frames} {count}\n" for frames, count in sorted(merged.items()))
+
+
+def frame_name(stmt):
+    name = stmt.__class__.__name__
+    if stmt.line is None:
+        return name
+    return f"{name}:{stmt.line}"
@@ -0,0 +1 @@
+# Runtime module for the Lox interpreter
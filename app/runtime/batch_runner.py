@@ -0,0 +1,179 @@
+import json
+import os
+import time
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import wait
+from app.runtime.lox_runtime import LoxRuntime
+
+
+OK = "ok"
+ERROR = "error"
+TIMEOUT = "timeout"
+CRASHED = "crashed"
+
+
+class JobResult:
+    # Outcome of one batch job. exit_code is what `interpret` would have
+    # exited with, or None when the job timed out or its worker died.
+    def __init__(self, path, status, exit_code, stdout, stderr, elapsed):
+        self.path = path
+        self.status = status
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.elapsed = elapsed
+
+    def to_dict(self):
+        return {
+            "path": self.path,
+            "status": self.status,
+            "exit_code": self.exit_code,
+            "time": self.elapsed,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+
+def find_jobs(paths):
+    # Files are taken as given, directories contribute their .lox files
+    # (recursively, in sorted order)
+    jobs = []
+    for path in paths:
+        if not os.path.isdir(path):
+            jobs.append(path)
+            continue
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.endswith(".lox"):
+                    jobs.append(os.path.join(directory, name))
+    return jobs
+
+
+def read_manifest(path):
+    # One job path per line, relative to the manifest's directory; blank
+    # lines and lines starting with # are skipped
+    base = os.path.dirname(path)
+    with open(path) as file:
+        lines = [line.strip() for line in file]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith("#")]
+
+
+def worker_main(connection, options):
+    # Runs jobs sent by BatchRunner until it sends None. One LoxRuntime
+    # serves every job, with its output captured per run.
+    runtime = LoxRuntime(options)
+    while True:
+        path = connection.recv()
+        if path is None:
+            return
+        try:
+            with open(path) as file:
+                source = file.read()
+            result = runtime.run(source)
+            stderr = "".join(f"{diagnostic}\n" for diagnostic in result.diagnostics)
+            reply = (OK if result.ok else ERROR, result.exit_code, result.output, stderr)
+        except Exception as error:
+            # Anything the CLI would have died of with a traceback
+            reply = (ERROR, 1, "", f"{type(error).__name__}: {error}\n")
+        connection.send(reply)
+
+
+class Worker:
+    def __init__(self, context, options):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child, options), daemon=True)
+        self.process.start()
+        child.close()
+        self.job = None
+        self.started = 0.0
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class BatchRunner:
+    # Runs many scripts on a pool of worker processes, each reused for as
+    # many jobs as it gets, so process start-up is paid once per worker
+    # instead of once per script. Jobs are handed out one at a time to idle
+    # workers. A job still running after timeout seconds has its worker
+    # killed and replaced, as does a job whose worker dies. Results come
+    # back in job order whatever order the jobs finish in.
+    def __init__(self, options, workers, timeout=None):
+        self.options = options
+        self.workers = workers
+        self.timeout = timeout
+        self.context = multiprocessing.get_context()
+
+    def run(self, paths):
+        pending = deque(enumerate(paths))
+        results = {}
+        emitted = 0
+        idle = []
+        busy = {}
+        try:
+            for _ in range(min(self.workers, len(paths))):
+                idle.append(Worker(self.context, self.options))
+
+            while pending or busy:
+                while pending and idle:
+                    worker = idle.pop()
+                    worker.job = pending.popleft()
+                    worker.started = time.perf_counter()
+                    worker.connection.send(worker.job[1])
+                    busy[worker.connection] = worker
+
+                for connection in wait(list(busy), self.wait_time(busy.values())):
+                    worker = busy.pop(connection)
+                    index, path = worker.job
+                    elapsed = time.perf_counter() - worker.started
+                    try:
+                        status, exit_code, stdout, stderr = connection.recv()
+                    except (EOFError, OSError):
+                        worker.kill()
+                        results[index] = JobResult(path, CRASHED, None, "", "", elapsed)
+                        if pending:
+                            idle.append(Worker(self.context, self.options))
+                        continue
+                    results[index] = JobResult(path, status, exit_code, stdout, stderr, elapsed)
+                    idle.append(worker)
+
+                if self.timeout is not None:
+                    now = time.perf_counter()
+                    for connection, worker in list(busy.items()):
+                        if now - worker.started >= self.timeout:
+                            del busy[connection]
+                            worker.kill()
+                            index, path = worker.job
+                            results[index] = JobResult(path, TIMEOUT, None, "", "", now - worker.started)
+                            if pending:
+                                idle.append(Worker(self.context, self.options))
+
+                while emitted in results:
+                    yield results.pop(emitted)
+                    emitted += 1
+        finally:
+            for worker in idle:
+                worker.stop()
+            for worker in idle:
+                worker.process.join()
+            for worker in busy.values():
+                worker.kill()
+
+    def wait_time(self, workers):
+        if self.timeout is None:
+            return None
+        now = time.perf_counter()
+        return max(0.0, min(worker.started + self.timeout - now for worker in workers))
@@ -0,0 +1,73 @@
+import time
+from app.runtime.diagnostic import BudgetExceeded
+
+
+# Loop iterations between checks of the step and environment counts
+CHECK_INTERVAL = 1024
+
+
+class Budget:
+    # Per-run limits, any of which may be None:
+    #
+    #   max_steps         loop iterations (back-edges) the run may take
+    #   timeout           seconds of wall-clock time
+    #   max_string_length length of the longest string concatenation builds
+    #   max_environments  environments alive at once, globals included
+    #
+    # Only loops can make a run take long, since there are no calls: code
+    # without them runs each statement at most once. So the engines call
+    # tick() on loop back-edges and nowhere else. An iteration can take
+    # arbitrarily long (a loop body may hold thousands of statements), so
+    # with a deadline tick() reads the clock every time; perf_counter() is
+    # cheap next to any loop iteration. The counted limits are checked every
+    # CHECK_INTERVAL iterations (sooner when fewer steps are left).
+    # Environments only live while their block runs, so the live ones are
+    # exactly the current scope chain, which is counted at those checks.
+    # String length is checked by concat(), the only way strings grow; each
+    # engine passes it the limit of its own Budget (see string_limit()).
+    # Going over any limit raises BudgetExceeded.
+    def __init__(self, max_steps=None, timeout=None, max_string_length=None, max_environments=None):
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.max_string_length = max_string_length
+        self.max_environments = max_environments
+        self.steps = 0
+        self.period = 0
+        self.countdown = 0
+        self.deadline = None
+
+    def start(self):
+        self.steps = 0
+        self.deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+        self.period = self.countdown = self.interval()
+
+    def interval(self):
+        if self.max_steps is None:
+            return CHECK_INTERVAL
+        return max(1, min(CHECK_INTERVAL, self.max_steps + 1 - self.steps))
+
+    def tick(self, environment):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise BudgetExceeded(f"Time limit of {self.timeout:g}s exceeded.")
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.check(environment)
+
+    def check(self, environment):
+        self.steps += self.period
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise BudgetExceeded(f"Step limit of {self.max_steps} exceeded.")
+        if self.max_environments is not None:
+            count = 0
+            while environment is not None:
+                count += 1
+                environment = environment.enclosing
+            if count > self.max_environments:
+                raise BudgetExceeded(f"Environment limit of {self.max_environments} exceeded.")
+        self.period = self.countdown = self.interval()
+
+
+def string_limit(budget):
+    # The limit an engine running under budget, which may be None, passes
+    # to concat()
+    return None if budget is None else budget.max_string_length
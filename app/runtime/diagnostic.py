@@ -0,0 +1,40 @@
+SCAN_ERROR = "scan"
+PARSE_ERROR = "parse"
+RUNTIME_ERROR = "runtime"
+BUDGET_ERROR = "budget"
+
+
+class Diagnostic:
+    # One error reported by a run. str() is the line the CLI prints on
+    # stderr, e.g. "[line 3] Error at ';': Expect expression." or
+    # "Runtime Error: Operands must be numbers."
+    def __init__(self, kind, message, line=None, where=""):
+        self.kind = kind
+        self.message = message
+        self.line = line
+        self.where = where
+
+    def __str__(self):
+        if self.kind == RUNTIME_ERROR:
+            return f"Runtime Error: {self.message}"
+        if self.kind == BUDGET_ERROR:
+            return f"Budget Exceeded: {self.message}"
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.kind!r}, {self.message!r}, {self.line!r})"
+
+
+class LoxError(Exception):
+    # Raised by the Scanner, Parser and interpreters to end a run; the
+    # diagnostic describes why. The first error ends the run, as before.
+    def __init__(self, diagnostic):
+        super().__init__(str(diagnostic))
+        self.diagnostic = diagnostic
+
+
+class BudgetExceeded(LoxError):
+    # Raised when a run goes over one of the limits of its Budget. It is not
+    # a RuntimeError, so the interpreters pass it through untouched.
+    def __init__(self, message):
+        super().__init__(Diagnostic(BUDGET_ERROR, message))
@@ -0,0 +1,268 @@
+import io
+from app.scanner.scanner import Scanner
+from app.scanner.regex_scanner import RegexScanner
+from app.scanner.buffer_scanner import BufferScanner
+from app.parser.parser import Parser
+from app.parser.pratt_parser import PrattParser
+from app.ast.ast_printer import AstPrinter
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.resolver import Resolver
+from app.interpreter.closure_compiler import ClosureInterpreter
+from app.interpreter.instrumented_interpreter import InstrumentedInterpreter
+from app.interpreter.profiling_interpreter import ProfilingInterpreter
+from app.interpreter.quickening_interpreter import QuickeningInterpreter
+from app.optimizer.optimizer import Optimizer
+from app.optimizer.type_inference import TypeInference
+from app.token.token_stream import TokenStream
+from app.output.output_sink import OutputSink, DEFAULT_BUFFER_SIZE
+from app.stats.stats import measure
+from app.cache.parse_cache import ParseCache, DEFAULT_CACHE_SIZE
+from app.runtime.diagnostic import LoxError
+from app.runtime.budget import Budget, string_limit
+from app.vm.compiler import Compiler
+from app.vm.vm import VM
+
+
+COMMANDS = ("tokenize", "parse", "ast-print", "interpret", "run-vm")
+
+SCANNERS = {
+    "default": Scanner,
+    "regex": RegexScanner,
+    "buffer": BufferScanner,
+}
+
+# The Pratt parser needs no recursion, so it is the default; the
+# recursive-descent Parser is kept as the reference implementation
+PARSERS = {
+    "pratt": PrattParser,
+    "descent": Parser,
+}
+
+# Count options and the Budget limits they set
+BUDGET_OPTIONS = {
+    "max-steps": "max_steps",
+    "max-string": "max_string_length",
+    "max-environments": "max_environments",
+}
+
+STATS_CONFLICT = "--stats cannot be combined with --compile, --quicken or --profile"
+
+
+class Result:
+    # What one run produced. output is the text written by the program when
+    # the runtime captures it, None when it writes to a caller's stream.
+    def __init__(self, output, diagnostics, exit_code):
+        self.output = output
+        self.diagnostics = diagnostics
+        self.exit_code = exit_code
+
+    @property
+    def ok(self):
+        return self.exit_code == 0
+
+
+class LoxRuntime:
+    # Runs Lox sources in-process and reports errors as diagnostics instead
+    # of exiting. Options use the CLI's names and values (see main.py) and
+    # are checked once here; invalid ones raise ValueError.
+    #
+    # Every run gets its own globals and interpreter, so runs never see
+    # each other's variables; what is shared is only what is fixed by the
+    # options: the output sink, the parse cache and the option checks.
+    # Without a stream, each run's output is captured into Result.output.
+    # The parse cache writes to disk, so it is opt-in: it is only used with
+    # the cache or cache-dir option (the CLI sets cache unless --no-cache).
+    def __init__(self, options=None, stream=None):
+        options = dict(options or {})
+        self.options = options
+
+        compile_mode = options.get("compile")
+        if compile_mode is not None and compile_mode != "closures":
+            raise ValueError(f"Unknown compile mode: {compile_mode}")
+
+        scanner_name = options.get("scanner", "default")
+        if scanner_name not in SCANNERS:
+            raise ValueError(f"Unknown scanner: {scanner_name}")
+
+        parser_name = options.get("parser", "pratt")
+        if parser_name not in PARSERS:
+            raise ValueError(f"Unknown parser: {parser_name}")
+
+        buffer_size = options.get("buffer-size", DEFAULT_BUFFER_SIZE)
+        if not str(buffer_size).isdigit():
+            raise ValueError(f"Invalid buffer size: {buffer_size}")
+
+        cache_size = options.get("cache-size", DEFAULT_CACHE_SIZE)
+        if not str(cache_size).isdigit():
+            raise ValueError(f"Invalid cache size: {cache_size}")
+        if options.get("cache-dir") is True:
+            raise ValueError("--cache-dir requires a directory")
+
+        if options.get("quicken") and compile_mode is not None:
+            raise ValueError("--quicken cannot be combined with --compile")
+
+        self.budget = make_budget(options)
+
+        self.captured = io.StringIO() if stream is None else None
+        self.output = OutputSink(
+            stream if stream is not None else self.captured,
+            buffer_size=int(buffer_size),
+            line_buffered=bool(options.get("line-buffered")),
+        )
+        self.cache = None
+        if (options.get("cache") or options.get("cache-dir")) and not options.get("no-cache"):
+            self.cache = ParseCache(options.get("cache-dir"), int(cache_size))
+
+    def run(self, source, command="interpret", stats=None, profiler=None):
+        if command not in COMMANDS:
+            raise ValueError(f"Unknown command: {command}")
+        # Only InstrumentedInterpreter counts visits, environments and
+        # lookups, so stats for another engine would describe the wrong one
+        if stats is not None and (self.options.get("compile") is not None or self.options.get("quicken") or profiler is not None):
+            raise ValueError(STATS_CONFLICT)
+
+        diagnostics = []
+        if self.budget is not None:
+            self.budget.start()
+        try:
+            self.execute(command, source, stats, profiler)
+        except LoxError as error:
+            diagnostics.append(error.diagnostic)
+        finally:
+            self.output.flush()
+
+        output = None
+        if self.captured is not None:
+            output = self.captured.getvalue()
+            self.captured.seek(0)
+            self.captured.truncate()
+        return Result(output, diagnostics, 1 if diagnostics else 0)
+
+    def execute(self, command, source, stats, profiler):
+        options = self.options
+        output = self.output
+        scanner_name = options.get("scanner", "default")
+
+        # Streaming scans, parses and executes one declaration at a time, so
+        # output starts before the whole file has been parsed
+        stream = options.get("stream") and command in ("tokenize", "parse", "interpret")
+
+        if command == "tokenize":
+            scanner = SCANNERS[scanner_name](source)
+            with measure(stats, "scan"):
+                tokens = scanner.iter_tokens() if stream else scanner.scan_tokens()
+            for token in tokens:
+                output.write_line(str(token))
+            return
+
+        # A cached AST skips the Scanner and Parser entirely. Streaming never
+        # holds the whole statement list, so it always parses from source.
+        cache = self.cache if not stream else None
+        statements = None
+        if cache is not None:
+            with measure(stats, "cache"):
+                statements = cache.load(source)
+
+        if statements is None:
+            statements = parse_source(source, scanner_name, options.get("parser", "pratt"), stream, stats)
+            if cache is not None:
+                with measure(stats, "cache"):
+                    cache.store(source, statements)
+
+        if command == "parse":
+            for statement in statements:
+                output.write_line(str(statement))
+        elif command == "ast-print":
+            # For simplicity, we'll just print the first statement's expression
+            if statements:
+                printer = AstPrinter()
+                if hasattr(statements[0], 'expression'):
+                    output.write_line(printer.print(statements[0].expression))
+        elif command == "run-vm":
+            with measure(stats, "compile"):
+                chunk = Compiler().compile(statements)
+            vm = VM(output)
+            vm.budget = self.budget
+            with measure(stats, "interpret"):
+                vm.interpret(chunk)
+        else:
+            interpreter = self.make_interpreter(stats, profiler)
+            inference = None
+            if options.get("opt"):
+                inference = TypeInference(interpreter.unchecked, string_limit(self.budget))
+            with measure(stats, "resolve"):
+                statements = prepare(statements, inference)
+                if stats is not None and not stream:
+                    statements = list(statements)
+            with measure(stats, "interpret"):
+                interpreter.interpret(statements)
+
+    def make_interpreter(self, stats=None, profiler=None):
+        output = self.output
+        if self.options.get("compile") == "closures":
+            interpreter = ClosureInterpreter(output)
+        elif profiler is not None:
+            interpreter = ProfilingInterpreter(profiler, output)
+        elif stats is not None:
+            interpreter = InstrumentedInterpreter(stats, output)
+        elif self.options.get("quicken"):
+            interpreter = QuickeningInterpreter(output)
+        else:
+            interpreter = Interpreter(output)
+        interpreter.budget = self.budget
+        return interpreter
+
+
+def make_budget(options):
+    # Counts are plain integers; --timeout is in milliseconds, like
+    # --profile-interval. None when no limit is set.
+    limits = {}
+    for option, limit in BUDGET_OPTIONS.items():
+        value = options.get(option)
+        if value is None:
+            continue
+        if not str(value).isdigit():
+            raise ValueError(f"Invalid {option.replace('-', ' ')}: {value}")
+        limits[limit] = int(value)
+
+    timeout = options.get("timeout")
+    if timeout is not None:
+        try:
+            timeout = float(timeout) / 1000
+        except ValueError:
+            timeout = 0
+        if not timeout > 0:
+            raise ValueError(f"Invalid timeout: {options.get('timeout')}")
+        limits["timeout"] = timeout
+
+    return Budget(**limits) if limits else None
+
+
+def prepare(statements, inference=None):
+    # The Optimizer, Resolver and TypeInference handle one top-level
+    # statement at a time, so a streamed program stays lazy all the way to
+    # the interpreter. Under --opt the caller passes the TypeInference,
+    # made with the table of the interpreter that will run the statements;
+    # the Optimizer folds under the same string limit.
+    optimizer = Optimizer(inference.string_limit) if inference is not None else None
+    resolver = Resolver()
+    for statement in statements:
+        batch = optimizer.optimize([statement]) if optimizer else [statement]
+        batch = resolver.resolve(batch)
+        yield from inference.infer(batch) if inference else batch
+
+
+def parse_source(source, scanner_name, parser_name, stream, stats):
+    # In streaming mode scanning and parsing happen lazily while the next
+    # phase consumes them, so their time is reported under that phase
+    scanner = SCANNERS[scanner_name](source)
+    with measure(stats, "scan"):
+        if stream:
+            tokens = scanner.iter_tokens()
+        else:
+            tokens = scanner.scan_tokens()
+    parser_class = PARSERS[parser_name]
+    with measure(stats, "parse"):
+        if stream:
+            return parser_class(TokenStream(tokens)).declarations()
+        return parser_class(tokens).parse()
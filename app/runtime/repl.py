@@ -0,0 +1,162 @@
+from app.scanner.scanner import Scanner
+from app.token.token import Token
+from app.token.token_type import TokenType
+from app.runtime.diagnostic import LoxError
+from app.optimizer.type_inference import TypeInference
+from app.runtime.budget import string_limit
+from app.runtime.lox_runtime import PARSERS, prepare
+
+
+PROMPT = "> "
+CONTINUATION_PROMPT = "... "
+
+OPENING = (TokenType.LEFT_BRACE, TokenType.LEFT_PAREN)
+CLOSING = (TokenType.RIGHT_BRACE, TokenType.RIGHT_PAREN)
+
+
+class LineScanner(Scanner):
+    # Scans REPL input one line at a time, keeping the line count across
+    # lines. A string still open at the end of a line is not an error: its
+    # text, from the opening quote, is carried over and scanned again with
+    # the next line, so only the string itself is ever scanned twice.
+    def __init__(self):
+        super().__init__("")
+        self.carry = ""
+
+    def scan_line(self, text):
+        self.source = self.carry + text + "\n"
+        self.carry = ""
+        self.tokens = []
+        self.start = 0
+        self.current = 0
+        while not self.is_at_end():
+            self.start = self.current
+            self.scan_token()
+        return self.tokens
+
+    def string(self):
+        if self.source.find('"', self.current) < 0:
+            # self.line is still the line of the opening quote
+            self.carry = self.source[self.start:]
+            self.current = len(self.source)
+            return
+        super().string()
+
+    def finish(self):
+        # End of input: a carried string really is unterminated
+        if self.carry:
+            line = self.line + self.carry.count("\n")
+            self.carry = ""
+            self.error(line, "Unterminated string.")
+
+
+class Repl:
+    # Read-eval-print loop on one interpreter, so globals persist from one
+    # input to the next. Each line is scanned once, when it is entered, and
+    # its tokens are kept until they make up whole statements: while a brace,
+    # parenthesis or string is open nothing is parsed, and a statement that
+    # only fails at the end of the input so far (`if (x)`, a missing `;`)
+    # waits for the next line. A blank line ends such a statement and reports
+    # the error. The work per input depends on that input only, not on the
+    # length of the session.
+    #
+    # Under --opt one TypeInference serves the whole session, so an input is
+    # typed with what earlier inputs assigned to the globals it uses.
+    def __init__(self, runtime, errors):
+        self.errors = errors
+        self.interpreter = runtime.make_interpreter()
+        self.budget = runtime.budget
+        self.parser_class = PARSERS[runtime.options.get("parser", "pratt")]
+        self.inference = None
+        if runtime.options.get("opt"):
+            self.inference = TypeInference(self.interpreter.unchecked, string_limit(self.budget))
+        self.scanner = LineScanner()
+        self.tokens = []
+        self.depth = 0
+
+    def run(self, lines):
+        for line in lines:
+            self.feed(line.rstrip("\n"))
+        self.finish()
+
+    def pending(self):
+        return bool(self.tokens or self.scanner.carry)
+
+    def feed(self, line):
+        # Returns True while the input so far is an unfinished statement
+        try:
+            tokens = self.scanner.scan_line(line)
+        except LoxError as error:
+            self.report(error)
+            return False
+
+        depth = self.depth
+        for token in tokens:
+            if token.type in OPENING:
+                depth += 1
+            elif token.type in CLOSING:
+                depth -= 1
+        self.depth = depth
+        self.tokens.extend(tokens)
+
+        if self.scanner.carry or depth > 0:
+            return True
+        if not self.tokens:
+            return False
+        return self.evaluate(not line.strip())
+
+    def finish(self):
+        try:
+            self.scanner.finish()
+        except LoxError as error:
+            self.report(error)
+            return
+        if self.tokens:
+            self.evaluate(True)
+
+    def evaluate(self, final):
+        tokens = self.tokens + [Token(TokenType.EOF, "", None, self.scanner.line)]
+        try:
+            statements = self.parser_class(tokens).parse()
+        except LoxError as error:
+            if not final and error.diagnostic.where == " at end":
+                return True
+            self.report(error)
+            return False
+
+        self.cancel()
+        # Each input gets the whole budget
+        if self.budget is not None:
+            self.budget.start()
+        try:
+            self.interpreter.interpret(prepare(statements, self.inference))
+        except LoxError as error:
+            self.report(error)
+        except KeyboardInterrupt:
+            # Stops a runaway loop without ending the session
+            print("Interrupted.", file=self.errors)
+        return False
+
+    def cancel(self):
+        self.tokens = []
+        self.depth = 0
+        self.scanner.carry = ""
+
+    def report(self, error):
+        self.cancel()
+        print(error.diagnostic, file=self.errors)
+        self.errors.flush()
+
+
+def prompt_lines(repl):
+    # Lines typed at a terminal, prompting with "... " while a statement is
+    # unfinished. Ctrl-C discards the unfinished statement, Ctrl-D ends.
+    while True:
+        try:
+            yield input(CONTINUATION_PROMPT if repl.pending() else PROMPT)
+        except KeyboardInterrupt:
+            print()
+            repl.cancel()
+        except EOFError:
+            print()
+            return
@@ -0,0 +1,47 @@
+from app.token.token_type import TokenType
+from app.token.token_buffer import TokenBuffer, STRING_LITERAL
+from app.scanner.regex_scanner import RegexScanner, TOKEN_PATTERN, OPERATORS
+
+
+class BufferScanner(RegexScanner):
+    # Same tokenization as RegexScanner, but scan_tokens() returns a
+    # TokenBuffer of offsets into the source instead of a list of Tokens.
+
+    def scan_tokens(self):
+        source = self.source
+        tokens = TokenBuffer(source)
+        append = tokens.append
+        keyword = self.keywords.get
+        operators = OPERATORS
+        identifier = TokenType.IDENTIFIER
+        line = 1
+
+        for match in TOKEN_PATTERN.finditer(source):
+            group = match.lastindex
+            if group == 1:
+                start, end = match.span(1)
+                append(keyword(source[start:end], identifier), start, end - start, line)
+            elif group == 2:
+                start, end = match.span(2)
+                append(operators[source[start:end]], start, end - start, line)
+            elif group == 3:
+                line += 1
+            elif group == 4:
+                start, end = match.span(4)
+                literal_index = tokens.add_number(float(source[start:end]))
+                append(TokenType.NUMBER, start, end - start, line, literal_index)
+            elif group == 6:
+                start = match.start(5)
+                end = match.end(6)
+                line += source.count("\n", start, end)
+                if end == match.end(5):
+                    self.error(line, "Unterminated string.")
+                append(TokenType.STRING, start, end - start, line, STRING_LITERAL)
+            elif group == 7:
+                self.error(line, "Unexpected character.")
+
+        self.line = line
+        self.current = len(source)
+        tokens.append(TokenType.EOF, len(source), 0, line)
+        self.tokens = tokens
+        return tokens
@@ -0,0 +1,115 @@
+import re
+from app.token.token_type import TokenType
+from app.token.token import Token
+from app.scanner.scanner import Scanner
+
+
+# Leading blanks and a trailing comment are absorbed into the same match as
+# the token that follows, so findall() yields exactly one tuple per token or
+# newline. At most one group in each tuple is non-empty. Operators list the
+# two-character forms first, and the final catch-all turns any other
+# character into an error.
+TOKEN_PATTERN = re.compile(r"""
+    [ \t\r]* (?://[^\n]*)?
+    (?:
+        ([A-Za-z_][A-Za-z0-9_]*)                # identifier or keyword
+      | (!=|==|<=|>=|[(){},.\-+;*/!=<>])        # operator
+      | (\n)                                    # newline
+      | ([0-9]+(?:\.[0-9]+)?)                   # number
+      | ("[^"]*)("?)                            # string, closing quote optional
+      | (.)                                     # unexpected character
+      | \Z                                      # blanks or a comment at the end
+    )
+""", re.VERBOSE | re.DOTALL)
+
+OPERATORS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+    "/": TokenType.SLASH,
+    "!": TokenType.BANG,
+    "!=": TokenType.BANG_EQUAL,
+    "=": TokenType.EQUAL,
+    "==": TokenType.EQUAL_EQUAL,
+    "<": TokenType.LESS,
+    "<=": TokenType.LESS_EQUAL,
+    ">": TokenType.GREATER,
+    ">=": TokenType.GREATER_EQUAL,
+}
+
+
+class RegexScanner(Scanner):
+    # Drop-in replacement for Scanner that tokenizes with a single compiled
+    # pattern instead of a Python method call per character. It produces the
+    # same Token objects, line numbers and error reports.
+
+    def scan_tokens(self):
+        tokens = self.tokens
+        append = tokens.append
+        keyword = self.keywords.get
+        operators = OPERATORS
+        identifier = TokenType.IDENTIFIER
+        line = 1
+
+        for name, operator, newline, number, string, closing, unexpected in TOKEN_PATTERN.findall(self.source):
+            if name:
+                append(Token(keyword(name, identifier), name, None, line))
+            elif operator:
+                append(Token(operators[operator], operator, None, line))
+            elif newline:
+                line += 1
+            elif number:
+                append(Token(TokenType.NUMBER, number, float(number), line))
+            elif string:
+                line += string.count("\n")
+                if not closing:
+                    self.error(line, "Unterminated string.")
+                append(Token(TokenType.STRING, string + closing, string[1:], line))
+            elif unexpected:
+                self.error(line, "Unexpected character.")
+
+        self.line = line
+        self.current = len(self.source)
+        append(Token(TokenType.EOF, "", None, line))
+        return tokens
+
+    def iter_tokens(self):
+        # finditer() keeps the scan lazy; group numbers follow TOKEN_PATTERN
+        source = self.source
+        keyword = self.keywords.get
+        operators = OPERATORS
+        identifier = TokenType.IDENTIFIER
+        line = 1
+
+        for match in TOKEN_PATTERN.finditer(source):
+            group = match.lastindex
+            if group == 1:
+                name = match.group(1)
+                yield Token(keyword(name, identifier), name, None, line)
+            elif group == 2:
+                operator = match.group(2)
+                yield Token(operators[operator], operator, None, line)
+            elif group == 3:
+                line += 1
+            elif group == 4:
+                number = match.group(4)
+                yield Token(TokenType.NUMBER, number, float(number), line)
+            elif group == 6:
+                string, closing = match.group(5, 6)
+                line += string.count("\n")
+                if not closing:
+                    self.error(line, "Unterminated string.")
+                yield Token(TokenType.STRING, string + closing, string[1:], line)
+            elif group == 7:
+                self.error(line, "Unexpected character.")
+
+        self.line = line
+        self.current = len(source)
+        yield Token(TokenType.EOF, "", None, line)
@@ -1,4 +1,4 @@
-import sys
+from app.runtime.diagnostic import Diagnostic, LoxError, SCAN_ERROR
 from app.token.token_type import TokenType
 from app.token.token import Token
 
@@ -39,6 +39,18 @@ class Scanner:
         self.tokens.append(Token(TokenType.EOF, "", None, self.line))
         return self.tokens
 
+    def iter_tokens(self):
+        # Lazy variant of scan_tokens() for streaming: yields each token as
+        # soon as it is scanned instead of collecting the whole list.
+        while not self.is_at_end():
+            self.start = self.current
+            self.scan_token()
+            if self.tokens:
+                yield from self.tokens
+                self.tokens.clear()
+
+        yield Token(TokenType.EOF, "", None, self.line)
+
     def is_at_end(self):
         return self.current >= len(self.source)
 
@@ -186,5 +198,4 @@ class Scanner:
         self.report(line, "", message)
 
     def report(self, line, where, message):
-        print(f"[line {line}] Error{where}: {message}", file=sys.stderr)
-        sys.exit(1)
\ No newline at end of file
+        raise LoxError(Diagnostic(SCAN_ERROR, message, line, where))
\ No newline at end of file
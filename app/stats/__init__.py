@@ -0,0 +1 @@
+# Stats module for the Lox interpreter
\ No newline at end of file
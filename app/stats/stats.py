@@ -0,0 +1,62 @@
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+
+class Stats:
+    # Counters filled in by the CLI phases and InstrumentedInterpreter.
+    # Nothing here is touched unless stats were requested, so the normal
+    # pipeline pays nothing for it.
+    def __init__(self):
+        self.phases = {}
+        self.node_visits = Counter()
+        # The globals environment exists from the start
+        self.environments = 1
+        self.lookups = 0
+        self.global_lookups = 0
+        self.lookup_depth = 0
+
+    @contextmanager
+    def phase(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            totals = self.phases.setdefault(name, {"wall": 0.0, "cpu": 0.0})
+            totals["wall"] += time.perf_counter() - wall
+            totals["cpu"] += time.process_time() - cpu
+
+    def record_lookup(self, depth):
+        # depth is the number of enclosing environments walked; None means
+        # the name was resolved as a global and read from the globals table
+        self.lookups += 1
+        if depth is None:
+            self.global_lookups += 1
+        else:
+            self.lookup_depth += depth
+
+    def to_dict(self):
+        local_lookups = self.lookups - self.global_lookups
+        return {
+            "phases": self.phases,
+            "node_visits": {node.__name__: count for node, count in self.node_visits.most_common()},
+            "environments_created": self.environments,
+            "lookups": {
+                "total": self.lookups,
+                "global": self.global_lookups,
+                "local": local_lookups,
+                "average_local_depth": self.lookup_depth / local_lookups if local_lookups else 0.0,
+            },
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+
+def measure(stats, name):
+    # Phase timer that is a no-op when stats are off
+    if stats is None:
+        return nullcontext()
+    return stats.phase(name)
@@ -1,4 +1,6 @@
 class Token:
+    __slots__ = ("type", "lexeme", "literal", "line")
+
     def __init__(self, type, lexeme, literal, line):
         self.type = type
         self.lexeme = lexeme
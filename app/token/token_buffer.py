@@ -0,0 +1,82 @@
+from array import array
+from app.token.token_type import TokenType
+from app.token.token import Token
+
+
+TOKEN_TYPES = list(TokenType)
+TYPE_CODES = {type: code for code, type in enumerate(TOKEN_TYPES)}
+
+# Values of the literal column that are not indexes into TokenBuffer.numbers
+NO_LITERAL = -1
+STRING_LITERAL = -2
+
+
+class TokenBuffer:
+    # Column-oriented token list over the original source text.
+    #
+    # Each token costs five array entries (about 21 bytes) instead of a Token
+    # object and a sliced lexeme. Token objects are created on demand when
+    # indexed or iterated, so code written against a list of Tokens (Parser,
+    # the tokenize command) works unchanged. String literals are sliced out
+    # of the source lazily; number literals are packed into a double array.
+    def __init__(self, source):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('l')
+        self.lengths = array('i')
+        self.lines = array('i')
+        self.literal_indexes = array('i')
+        self.numbers = array('d')
+        # The parser alternates between peek() and previous(), so keep the
+        # last two materialized tokens around.
+        self.recent = {}
+
+    def append(self, type, start, length, line, literal_index=NO_LITERAL):
+        self.types.append(TYPE_CODES[type])
+        self.starts.append(start)
+        self.lengths.append(length)
+        self.lines.append(line)
+        self.literal_indexes.append(literal_index)
+
+    def add_number(self, value):
+        self.numbers.append(value)
+        return len(self.numbers) - 1
+
+    def __len__(self):
+        return len(self.types)
+
+    def __iter__(self):
+        for index in range(len(self.types)):
+            yield self.token_at(index)
+
+    def __getitem__(self, index):
+        token = self.recent.get(index)
+        if token is None:
+            if len(self.recent) > 1:
+                self.recent.clear()
+            token = self.recent[index] = self.token_at(index)
+        return token
+
+    def type_at(self, index):
+        return TOKEN_TYPES[self.types[index]]
+
+    def line_at(self, index):
+        return self.lines[index]
+
+    def lexeme_at(self, index):
+        start = self.starts[index]
+        return self.source[start:start + self.lengths[index]]
+
+    def literal_at(self, index):
+        literal_index = self.literal_indexes[index]
+        if literal_index == NO_LITERAL:
+            return None
+        if literal_index == STRING_LITERAL:
+            start = self.starts[index]
+            return self.source[start + 1:start + self.lengths[index] - 1]
+        return self.numbers[literal_index]
+
+    def token_at(self, index):
+        if index < 0:
+            index += len(self.types)
+        return Token(self.type_at(index), self.lexeme_at(index), self.literal_at(index), self.lines[index])
@@ -0,0 +1,22 @@
+from collections import deque
+
+
+class TokenStream:
+    # Indexable view over a lazy token iterator, for streaming parses.
+    #
+    # Parser only ever looks at tokens[current] and tokens[current - 1], and
+    # current never moves backwards. So each access drops everything before
+    # the previous token, and the window stays a couple of tokens long no
+    # matter how large the script is.
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.window = deque()
+        self.offset = 0
+
+    def __getitem__(self, index):
+        while index - 1 > self.offset and self.window:
+            self.window.popleft()
+            self.offset += 1
+        while index >= self.offset + len(self.window):
+            self.window.append(next(self.tokens))
+        return self.window[index - self.offset]
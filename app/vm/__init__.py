@@ -0,0 +1 @@
+# VM module for the Lox interpreter
\ No newline at end of file
@@ -0,0 +1,49 @@
+from array import array
+from app.vm.opcode import OPCODE_NAMES, OPERAND_COUNTS, OP_CONSTANT, OP_GET_GLOBAL, OP_SET_GLOBAL, OP_DEFINE_GLOBAL
+
+
+CONSTANT_OPERANDS = (OP_CONSTANT, OP_GET_GLOBAL, OP_SET_GLOBAL, OP_DEFINE_GLOBAL)
+
+
+class Chunk:
+    def __init__(self):
+        # Word code: every opcode and operand takes one slot of a signed int array
+        self.code = array('i')
+        self.constants = []
+        # lines[i] is the source line of code[i], taken from Token.line
+        self.lines = array('i')
+        self.constant_indexes = {}
+
+    def write(self, word, line):
+        self.code.append(word)
+        self.lines.append(line)
+        return len(self.code) - 1
+
+    def add_constant(self, value):
+        # Reuse pool entries for repeated constants. The type is part of the key
+        # because 1.0 == True in Python, and floats are keyed by repr so that
+        # -0.0 does not collapse into 0.0.
+        key = (type(value), repr(value) if isinstance(value, float) else value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self.constant_indexes[key] = index
+        return index
+
+    def disassemble(self):
+        lines = []
+        offset = 0
+        while offset < len(self.code):
+            op = self.code[offset]
+            operands = OPERAND_COUNTS.get(op, 0)
+            text = f"{offset:04d} {self.lines[offset]:4d} {OPCODE_NAMES[op]}"
+            if operands:
+                operand = self.code[offset + 1]
+                text += f" {operand}"
+                if op in CONSTANT_OPERANDS:
+                    text += f" ({self.constants[operand]!r})"
+            lines.append(text)
+            offset += 1 + operands
+        return "\n".join(lines)
+
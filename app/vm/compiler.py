@@ -0,0 +1,193 @@
+from app.ast.expr import Binary, Grouping, Literal, Unary, Variable, Expression, Print, Var, Block, If, While, Assign, Logical
+from app.token.token_type import TokenType
+from app.ast.trampoline import trampoline
+from app.vm.chunk import Chunk
+from app.interpreter.numbers import number_literal
+from app.vm.opcode import (
+    OP_CONSTANT, OP_NIL, OP_TRUE, OP_FALSE, OP_POP, OP_GET_LOCAL, OP_SET_LOCAL,
+    OP_GET_GLOBAL, OP_SET_GLOBAL, OP_DEFINE_GLOBAL, OP_EQUAL, OP_NOT_EQUAL,
+    OP_GREATER, OP_GREATER_EQUAL, OP_LESS, OP_LESS_EQUAL, OP_ADD, OP_SUBTRACT,
+    OP_MULTIPLY, OP_DIVIDE, OP_NOT, OP_NEGATE, OP_PRINT, OP_JUMP,
+    OP_POP_JUMP_IF_FALSE, OP_JUMP_IF_FALSE_OR_POP, OP_JUMP_IF_TRUE_OR_POP,
+    OP_POPN, OP_RETURN, OP_LOOP,
+)
+
+
+BINARY_OPCODES = {
+    TokenType.PLUS: OP_ADD,
+    TokenType.MINUS: OP_SUBTRACT,
+    TokenType.STAR: OP_MULTIPLY,
+    TokenType.SLASH: OP_DIVIDE,
+    TokenType.GREATER: OP_GREATER,
+    TokenType.GREATER_EQUAL: OP_GREATER_EQUAL,
+    TokenType.LESS: OP_LESS,
+    TokenType.LESS_EQUAL: OP_LESS_EQUAL,
+    TokenType.EQUAL_EQUAL: OP_EQUAL,
+    TokenType.BANG_EQUAL: OP_NOT_EQUAL,
+}
+
+
+class Compiler:
+    # Visit methods are generators run by trampoline(), so deeply nested
+    # programs compile without recursion
+    def __init__(self):
+        self.chunk = Chunk()
+        # Block-scoped variables live in VM stack slots. Each entry is
+        # (name, scope depth); the list index is the slot number.
+        self.locals = []
+        self.scope_depth = 0
+        self.line = 0
+
+    def compile(self, statements):
+        for statement in statements:
+            if statement is not None:
+                trampoline(statement.accept(self))
+        self.emit(OP_RETURN)
+        return self.chunk
+
+    def emit(self, *words):
+        for word in words:
+            self.chunk.write(word, self.line)
+
+    def emit_jump(self, op):
+        self.emit(op, -1)
+        return len(self.chunk.code) - 1
+
+    def patch_jump(self, operand):
+        self.chunk.code[operand] = len(self.chunk.code)
+
+    def emit_constant(self, value):
+        self.emit(OP_CONSTANT, self.chunk.add_constant(value))
+
+    def mark_line(self, token):
+        self.line = token.line
+
+    def resolve_local(self, name):
+        for slot in range(len(self.locals) - 1, -1, -1):
+            if self.locals[slot][0] == name:
+                return slot
+        return -1
+
+    def visit_block_stmt(self, stmt: Block):
+        self.scope_depth += 1
+        for statement in stmt.statements:
+            if statement is not None:
+                yield statement.accept(self)
+        self.scope_depth -= 1
+
+        count = 0
+        while self.locals and self.locals[-1][1] > self.scope_depth:
+            self.locals.pop()
+            count += 1
+        if count == 1:
+            self.emit(OP_POP)
+        elif count > 1:
+            self.emit(OP_POPN, count)
+
+    def visit_if_stmt(self, stmt: If):
+        yield stmt.condition.accept(self)
+        else_jump = self.emit_jump(OP_POP_JUMP_IF_FALSE)
+        yield stmt.then_branch.accept(self)
+
+        if stmt.else_branch is None:
+            self.patch_jump(else_jump)
+            return
+
+        end_jump = self.emit_jump(OP_JUMP)
+        self.patch_jump(else_jump)
+        yield stmt.else_branch.accept(self)
+        self.patch_jump(end_jump)
+
+    def visit_while_stmt(self, stmt: While):
+        loop_start = len(self.chunk.code)
+        yield stmt.condition.accept(self)
+        exit_jump = self.emit_jump(OP_POP_JUMP_IF_FALSE)
+        yield stmt.body.accept(self)
+        self.emit(OP_LOOP, loop_start)
+        self.patch_jump(exit_jump)
+
+    def visit_var_stmt(self, stmt: Var):
+        self.mark_line(stmt.name)
+        if stmt.initializer is None:
+            self.emit(OP_NIL)
+        else:
+            yield stmt.initializer.accept(self)
+        self.mark_line(stmt.name)
+
+        name = stmt.name.lexeme
+        if self.scope_depth == 0:
+            self.emit(OP_DEFINE_GLOBAL, self.chunk.add_constant(name))
+            return
+
+        # The initializer is compiled before the name is declared, so
+        # `var a = a;` reads the outer `a` just like Environment.define does.
+        # Redeclaring a name in the same block reuses its slot.
+        slot = self.resolve_local(name)
+        if slot != -1 and self.locals[slot][1] == self.scope_depth:
+            self.emit(OP_SET_LOCAL, slot, OP_POP)
+            return
+        self.locals.append((name, self.scope_depth))
+
+    def visit_expression_stmt(self, stmt: Expression):
+        yield stmt.expression.accept(self)
+        self.emit(OP_POP)
+
+    def visit_print_stmt(self, stmt: Print):
+        yield stmt.expression.accept(self)
+        self.emit(OP_PRINT)
+
+    def visit_variable_expr(self, expr: Variable):
+        self.mark_line(expr.name)
+        slot = self.resolve_local(expr.name.lexeme)
+        if slot != -1:
+            self.emit(OP_GET_LOCAL, slot)
+        else:
+            self.emit(OP_GET_GLOBAL, self.chunk.add_constant(expr.name.lexeme))
+
+    def visit_assign_expr(self, expr: Assign):
+        yield expr.value.accept(self)
+        self.mark_line(expr.name)
+        slot = self.resolve_local(expr.name.lexeme)
+        if slot != -1:
+            self.emit(OP_SET_LOCAL, slot)
+        else:
+            self.emit(OP_SET_GLOBAL, self.chunk.add_constant(expr.name.lexeme))
+
+    def visit_logical_expr(self, expr: Logical):
+        yield expr.left.accept(self)
+        self.mark_line(expr.operator)
+        if expr.operator.type == TokenType.OR:
+            end_jump = self.emit_jump(OP_JUMP_IF_TRUE_OR_POP)
+        else:
+            end_jump = self.emit_jump(OP_JUMP_IF_FALSE_OR_POP)
+        yield expr.right.accept(self)
+        self.patch_jump(end_jump)
+
+    def visit_binary_expr(self, expr: Binary):
+        yield expr.left.accept(self)
+        yield expr.right.accept(self)
+        self.mark_line(expr.operator)
+        self.emit(BINARY_OPCODES[expr.operator.type])
+
+    def visit_grouping_expr(self, expr: Grouping):
+        yield expr.expression.accept(self)
+
+    def visit_literal_expr(self, expr: Literal):
+        if expr.value is None:
+            self.emit(OP_NIL)
+        elif expr.value is True:
+            self.emit(OP_TRUE)
+        elif expr.value is False:
+            self.emit(OP_FALSE)
+        elif expr.value.__class__ is float:
+            self.emit_constant(number_literal(expr.value))
+        else:
+            self.emit_constant(expr.value)
+
+    def visit_unary_expr(self, expr: Unary):
+        yield expr.right.accept(self)
+        self.mark_line(expr.operator)
+        if expr.operator.type == TokenType.MINUS:
+            self.emit(OP_NEGATE)
+        else:
+            self.emit(OP_NOT)
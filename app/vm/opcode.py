@@ -0,0 +1,52 @@
+# Opcodes are plain ints so the dispatch loop compares small ints instead of
+# Enum members. Operands follow the opcode as separate words in Chunk.code.
+
+OP_CONSTANT = 0         # index -> push constants[index]
+OP_NIL = 1
+OP_TRUE = 2
+OP_FALSE = 3
+OP_POP = 4
+OP_GET_LOCAL = 5        # slot
+OP_SET_LOCAL = 6        # slot
+OP_GET_GLOBAL = 7       # name index
+OP_SET_GLOBAL = 8       # name index
+OP_DEFINE_GLOBAL = 9    # name index
+OP_EQUAL = 10
+OP_NOT_EQUAL = 11
+OP_GREATER = 12
+OP_GREATER_EQUAL = 13
+OP_LESS = 14
+OP_LESS_EQUAL = 15
+OP_ADD = 16
+OP_SUBTRACT = 17
+OP_MULTIPLY = 18
+OP_DIVIDE = 19
+OP_NOT = 20
+OP_NEGATE = 21
+OP_PRINT = 22
+OP_JUMP = 23                # target
+OP_POP_JUMP_IF_FALSE = 24   # target
+OP_JUMP_IF_FALSE_OR_POP = 25  # target
+OP_JUMP_IF_TRUE_OR_POP = 26   # target
+OP_POPN = 27            # count
+OP_RETURN = 28
+OP_LOOP = 29            # target; a loop's back-edge, where budgets are checked
+
+OPCODE_NAMES = {
+    value: name for name, value in globals().items() if name.startswith("OP_")
+}
+
+OPERAND_COUNTS = {
+    OP_CONSTANT: 1,
+    OP_GET_LOCAL: 1,
+    OP_SET_LOCAL: 1,
+    OP_GET_GLOBAL: 1,
+    OP_SET_GLOBAL: 1,
+    OP_DEFINE_GLOBAL: 1,
+    OP_JUMP: 1,
+    OP_LOOP: 1,
+    OP_POP_JUMP_IF_FALSE: 1,
+    OP_JUMP_IF_FALSE_OR_POP: 1,
+    OP_JUMP_IF_TRUE_OR_POP: 1,
+    OP_POPN: 1,
+}
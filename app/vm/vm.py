@@ -0,0 +1,189 @@
+from app.runtime.diagnostic import Diagnostic, LoxError, RUNTIME_ERROR
+from app.runtime.budget import string_limit
+from app.interpreter.values import is_equal, stringify
+from app.interpreter.rope import STRING_TYPES, concat
+from app.interpreter.numbers import NUMBER_TYPES, add, subtract, multiply, negate
+from app.output.output_sink import OutputSink
+from app.vm.opcode import (
+    OP_CONSTANT, OP_NIL, OP_TRUE, OP_FALSE, OP_POP, OP_GET_LOCAL, OP_SET_LOCAL,
+    OP_GET_GLOBAL, OP_SET_GLOBAL, OP_DEFINE_GLOBAL, OP_EQUAL, OP_NOT_EQUAL,
+    OP_GREATER, OP_GREATER_EQUAL, OP_LESS, OP_LESS_EQUAL, OP_ADD, OP_SUBTRACT,
+    OP_MULTIPLY, OP_DIVIDE, OP_NOT, OP_NEGATE, OP_PRINT, OP_JUMP,
+    OP_POP_JUMP_IF_FALSE, OP_JUMP_IF_FALSE_OR_POP, OP_JUMP_IF_TRUE_OR_POP,
+    OP_POPN, OP_RETURN, OP_LOOP,
+)
+
+
+class VM:
+    def __init__(self, output=None):
+        self.globals = {}
+        self.output = output if output is not None else OutputSink()
+        # A Budget whose tick() runs on every OP_LOOP, or None
+        self.budget = None
+
+    def interpret(self, chunk):
+        try:
+            self.run(chunk)
+        except RuntimeError as error:
+            raise LoxError(Diagnostic(RUNTIME_ERROR, str(error))) from error
+        finally:
+            self.output.flush()
+
+    def run(self, chunk):
+        code = chunk.code
+        constants = chunk.constants
+        globals = self.globals
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        write_line = self.output.write_line
+        budget = self.budget
+        limit = string_limit(budget)
+        ip = 0
+
+        # Opcodes are tested roughly in order of how often loop bodies hit them
+        while True:
+            op = code[ip]
+            ip += 1
+
+            if op == OP_GET_LOCAL:
+                push(stack[code[ip]])
+                ip += 1
+            elif op == OP_CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == OP_GET_GLOBAL:
+                name = constants[code[ip]]
+                ip += 1
+                if name not in globals:
+                    raise RuntimeError(f"Undefined variable '{name}'.")
+                push(globals[name])
+            elif op == OP_SET_LOCAL:
+                stack[code[ip]] = stack[-1]
+                ip += 1
+            elif op == OP_SET_GLOBAL:
+                name = constants[code[ip]]
+                ip += 1
+                if name not in globals:
+                    raise RuntimeError(f"Undefined variable '{name}'.")
+                globals[name] = stack[-1]
+            elif op == OP_POP:
+                pop()
+            elif op == OP_POP_JUMP_IF_FALSE:
+                value = pop()
+                if value is None or value is False:
+                    ip = code[ip]
+                else:
+                    ip += 1
+            elif op == OP_LOOP:
+                if budget is not None:
+                    budget.tick(None)
+                ip = code[ip]
+            elif op == OP_JUMP:
+                ip = code[ip]
+            elif op == OP_ADD:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ in NUMBER_TYPES:
+                    if b.__class__ in NUMBER_TYPES:
+                        stack[-1] = add(a, b)
+                        continue
+                    if b.__class__ in STRING_TYPES:
+                        stack[-1] = concat(stringify(a), b, limit)
+                        continue
+                elif a.__class__ in STRING_TYPES:
+                    if b.__class__ in STRING_TYPES:
+                        stack[-1] = concat(a, b, limit)
+                        continue
+                    if b.__class__ in NUMBER_TYPES:
+                        stack[-1] = concat(a, stringify(b), limit)
+                        continue
+                raise RuntimeError("Operands must be two numbers or two strings.")
+            elif op == OP_LESS:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                stack[-1] = a < b
+            elif op == OP_SUBTRACT:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                stack[-1] = subtract(a, b)
+            elif op == OP_MULTIPLY:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                stack[-1] = multiply(a, b)
+            elif op == OP_PRINT:
+                write_line(stringify(pop()))
+            elif op == OP_LESS_EQUAL:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                stack[-1] = a <= b
+            elif op == OP_GREATER:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                stack[-1] = a > b
+            elif op == OP_GREATER_EQUAL:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                stack[-1] = a >= b
+            elif op == OP_DIVIDE:
+                b = pop()
+                a = stack[-1]
+                if a.__class__ not in NUMBER_TYPES or b.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operands must be numbers.")
+                if b == 0:
+                    raise RuntimeError("Division by zero")
+                stack[-1] = a / b
+            elif op == OP_EQUAL:
+                b = pop()
+                stack[-1] = is_equal(stack[-1], b)
+            elif op == OP_NOT_EQUAL:
+                b = pop()
+                stack[-1] = not is_equal(stack[-1], b)
+            elif op == OP_JUMP_IF_FALSE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip = code[ip]
+                else:
+                    pop()
+                    ip += 1
+            elif op == OP_JUMP_IF_TRUE_OR_POP:
+                value = stack[-1]
+                if value is None or value is False:
+                    pop()
+                    ip += 1
+                else:
+                    ip = code[ip]
+            elif op == OP_NEGATE:
+                value = stack[-1]
+                if value.__class__ not in NUMBER_TYPES:
+                    raise RuntimeError("Operand must be a number.")
+                stack[-1] = negate(value)
+            elif op == OP_NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False
+            elif op == OP_NIL:
+                push(None)
+            elif op == OP_TRUE:
+                push(True)
+            elif op == OP_FALSE:
+                push(False)
+            elif op == OP_POPN:
+                del stack[-code[ip]:]
+                ip += 1
+            elif op == OP_DEFINE_GLOBAL:
+                globals[constants[code[ip]]] = pop()
+                ip += 1
+            elif op == OP_RETURN:
+                return
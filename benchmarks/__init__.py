@@ -0,0 +1 @@
+# Benchmarks for the Lox interpreter
\ No newline at end of file
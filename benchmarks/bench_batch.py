@@ -0,0 +1,44 @@
+# Scripts per second for a directory of small jobs: one process per script
+# against the batch command with different worker counts.
+#
+#   python -m benchmarks.bench_batch [scripts]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks import workloads
+
+
+def measure(command):
+    start = time.perf_counter()
+    subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(count):
+            with open(os.path.join(directory, f"job{index:06}.lox"), "w") as file:
+                file.write(workloads.numeric_loop(20) + f"print {index};\n")
+        paths = sorted(os.path.join(directory, name) for name in os.listdir(directory))
+
+        print(f"{'configuration':<24}{'scripts':>10}{'time':>10}{'scripts/s':>12}")
+        # A process per script costs start-up every time; fewer of them
+        sample = paths[:max(1, count // 20)]
+        start = time.perf_counter()
+        for path in sample:
+            subprocess.run([sys.executable, "-m", "app.main", "interpret", path, "--no-cache"], stdout=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        print(f"{'process per script':<24}{len(sample):>10}{elapsed:>9.2f}s{len(sample) / elapsed:>12,.0f}")
+
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            elapsed = measure([sys.executable, "-m", "app.main", "batch", directory, "--no-cache", f"--workers={workers}"])
+            name = f"batch, {workers} worker{'s' if workers > 1 else ''}"
+            print(f"{name:<24}{count:>10}{elapsed:>9.2f}s{count / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Cost of each phase as nesting depth grows. Parsing, resolving, evaluating,
+# printing and caching all run without recursion, so time per level should
+# stay flat and no depth should hit the recursion limit.
+#
+#   python -m benchmarks.bench_depth [max depth]
+
+import io
+import sys
+import time
+from app.scanner.scanner import Scanner
+from app.parser.pratt_parser import PrattParser
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.resolver import Resolver
+from app.ast.ast_printer import AstPrinter
+from app.cache.ast_serializer import AstSerializer, AstDeserializer
+from app.output.output_sink import OutputSink
+from benchmarks import workloads
+
+
+SHAPES = {
+    "chain": workloads.deep_chain,
+    "groups": workloads.deep_groups,
+    "unary": workloads.deep_unary,
+    "blocks": workloads.deep_blocks,
+}
+
+PHASES = ("parse", "cache", "resolve", "interpret", "print")
+
+
+def timed(timings, phase, action):
+    start = time.perf_counter()
+    result = action()
+    timings[phase] = time.perf_counter() - start
+    return result
+
+
+def run(source):
+    timings = {}
+    tokens = Scanner(source).scan_tokens()
+    statements = timed(timings, "parse", lambda: PrattParser(tokens).parse())
+    statements = timed(timings, "cache", lambda: AstDeserializer().deserialize(AstSerializer().serialize(statements)))
+    # Only expression statements can be printed
+    expression = getattr(statements[0], "expression", None)
+    if expression is not None:
+        timed(timings, "print", lambda: AstPrinter().print(expression))
+    timed(timings, "resolve", lambda: Resolver().resolve(statements))
+    stream = io.StringIO()
+    output = OutputSink(stream)
+    timed(timings, "interpret", lambda: Interpreter(output).interpret(statements))
+    return timings, stream.getvalue()
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 64000
+    depths = []
+    depth = 1000
+    while depth <= max_depth:
+        depths.append(depth)
+        depth *= 4
+
+    print(f"{'shape':<8}{'depth':>8}" + "".join(f"{phase:>11}" for phase in PHASES) + f"{'us/level':>11}")
+    for shape, generate in SHAPES.items():
+        for depth in depths:
+            timings, output = run(generate(depth))
+            if output not in ("1\n", "-1\n", f"{depth}\n"):
+                print(f"{shape} at depth {depth}: unexpected output {output!r}", file=sys.stderr)
+                sys.exit(1)
+            cells = "".join(f"{timings[phase]:>10.3f}s" if phase in timings else f"{'-':>11}" for phase in PHASES)
+            per_level = sum(timings.values()) / depth * 1e6
+            print(f"{shape:<8}{depth:>8}{cells}{per_level:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
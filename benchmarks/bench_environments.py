@@ -0,0 +1,64 @@
+# Environments allocated and run time with and without the Resolver's scope
+# elision for blocks that declare nothing. Allocations are counted by
+# InstrumentedInterpreter; timings use the plain Interpreter.
+#
+#   python -m benchmarks.bench_environments [repeat]
+
+import contextlib
+import io
+import sys
+import time
+from app.scanner.scanner import Scanner
+from app.parser.parser import Parser
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.instrumented_interpreter import InstrumentedInterpreter
+from app.interpreter.resolver import Resolver
+from app.stats.stats import Stats
+from benchmarks import workloads
+
+
+WORKLOADS = {
+    "numeric_loop": workloads.numeric_loop(100000),
+    "while_loop": workloads.while_loop(100000),
+    "nested_blocks": workloads.nested_blocks(20, 2000),
+    "string_concat": workloads.string_concat(5000),
+}
+
+
+def prepare(source, elide_scopes):
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    return Resolver(elide_scopes).resolve(statements)
+
+
+def count_environments(source, elide_scopes):
+    stats = Stats()
+    with contextlib.redirect_stdout(io.StringIO()):
+        InstrumentedInterpreter(stats).interpret(prepare(source, elide_scopes))
+    return stats.environments
+
+
+def measure(source, elide_scopes, repeat):
+    best = None
+    for _ in range(repeat):
+        statements = prepare(source, elide_scopes)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            Interpreter().interpret(statements)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'workload':<16}{'envs (all)':>12}{'envs (elided)':>15}{'time (all)':>12}{'time (elided)':>15}")
+    for workload, source in WORKLOADS.items():
+        before = count_environments(source, False)
+        after = count_environments(source, True)
+        slow = measure(source, False, repeat)
+        fast = measure(source, True, repeat)
+        print(f"{workload:<16}{before:>12}{after:>15}{slow:>11.3f}s{fast:>14.3f}s")
+
+
+if __name__ == "__main__":
+    main()
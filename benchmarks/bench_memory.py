@@ -0,0 +1,78 @@
+# Memory used by the parsed AST: bytes per node and peak RSS while parsing
+# generated scripts of increasing size. Each size runs in a fresh process so
+# peak RSS is not inherited from the previous one.
+#
+#   python -m benchmarks.bench_memory [statements ...]
+
+import resource
+import subprocess
+import sys
+import time
+from app.ast.expr import Expr, Stmt
+from app.token.token import Token
+from app.scanner.scanner import Scanner
+from app.parser.parser import Parser
+from benchmarks import workloads
+
+
+SIZES = (10000, 100000, 1000000)
+
+
+def ast_size(statements):
+    # Returns (node count, bytes) for the nodes, their statement lists and the
+    # Tokens and lexemes they keep alive. Shared objects are counted once.
+    nodes = 0
+    size = sys.getsizeof(statements)
+    seen = set()
+    pending = list(statements)
+    while pending:
+        node = pending.pop()
+        nodes += 1
+        size += sys.getsizeof(node)
+        for name in type(node).__slots__:
+            child = getattr(node, name)
+            if isinstance(child, (Expr, Stmt)):
+                pending.append(child)
+            elif isinstance(child, list):
+                size += sys.getsizeof(child)
+                pending.extend(child)
+            elif isinstance(child, (Token, str, float)) and id(child) not in seen:
+                seen.add(id(child))
+                size += sys.getsizeof(child)
+                if isinstance(child, Token) and id(child.lexeme) not in seen:
+                    seen.add(id(child.lexeme))
+                    size += sys.getsizeof(child.lexeme)
+    return nodes, size
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(statements):
+    source = workloads.generated_program(statements)
+    start = time.perf_counter()
+    tokens = Scanner(source).scan_tokens()
+    parsed = Parser(tokens).parse()
+    elapsed = time.perf_counter() - start
+    del tokens
+    nodes, ast_bytes = ast_size(parsed)
+    print(f"{statements:>10}{nodes:>12}{ast_bytes / nodes:>14.1f}{ast_bytes / 1e6:>12.1f}"
+          f"{peak_rss_mb():>14.1f}{elapsed:>10.2f}s")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        measure(int(sys.argv[2]))
+        return
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'statements':>10}{'nodes':>12}{'bytes/node':>14}{'AST MB':>12}{'peak RSS MB':>14}{'parse':>11}")
+    for size in sizes:
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", "--child", str(size)], check=True)
+
+
+if __name__ == "__main__":
+    main()
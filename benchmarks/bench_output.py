@@ -0,0 +1,55 @@
+# Print-heavy scripts with stdout connected to a pipe, under different
+# OutputSink settings. Each run is a separate process so the pipe is real.
+#
+#   python -m benchmarks.bench_output [lines]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks import workloads
+
+
+CONFIGURATIONS = {
+    "line-buffered": ["--line-buffered"],
+    "unbuffered": ["--buffer-size=0"],
+    "4 KiB": ["--buffer-size=4096"],
+    "default": [],
+}
+
+# Lox print statements for the engines, a token dump for tokenize
+COMMANDS = {
+    "interpret": workloads.print_heavy,
+    "run-vm": workloads.print_heavy,
+    "tokenize": lambda count: workloads.mixed_source(count // 10),
+}
+
+
+def measure(command, path, flags):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "app.main", command, path] + flags, stdout=subprocess.PIPE)
+    lines = 0
+    for _ in process.stdout:
+        lines += 1
+    process.wait()
+    return time.perf_counter() - start, lines
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    print(f"{'command':<12}{'configuration':<16}{'lines':>10}{'time':>10}{'lines/s':>14}")
+    for command, workload in COMMANDS.items():
+        with tempfile.NamedTemporaryFile("w", suffix=".lox", delete=False) as file:
+            file.write(workload(count))
+            path = file.name
+        try:
+            for name, flags in CONFIGURATIONS.items():
+                elapsed, lines = measure(command, path, flags)
+                print(f"{command:<12}{name:<16}{lines:>10}{elapsed:>9.2f}s{lines / elapsed:>14,.0f}")
+        finally:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Statements per second of the recursive-descent Parser and the table-driven
+# PrattParser on large generated files. Both parsers must build the same
+# AST; they are compared through AstSerializer.
+#
+#   python -m benchmarks.bench_parser [statements]
+
+import sys
+import time
+from app.scanner.scanner import Scanner
+from app.parser.parser import Parser
+from app.parser.pratt_parser import PrattParser
+from app.cache.ast_serializer import AstSerializer
+from benchmarks import workloads
+
+
+PARSERS = {
+    "parser": Parser,
+    "pratt": PrattParser,
+}
+
+
+def measure(parser_class, tokens, repeat=3):
+    best = None
+    statements = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        statements = parser_class(tokens).parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, statements
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    sources = {
+        "generated_program": workloads.generated_program(count),
+        "mixed_source": workloads.mixed_source(count),
+        "straight_line": workloads.straight_line(count),
+    }
+
+    print(f"{'workload':<20}{'statements':>12}" + "".join(f"{name + ' stmt/s':>16}" for name in PARSERS) + f"{'speedup':>10}")
+    for workload, source in sources.items():
+        tokens = Scanner(source).scan_tokens()
+        rates = {}
+        trees = set()
+        for name, parser_class in PARSERS.items():
+            elapsed, statements = measure(parser_class, tokens)
+            rates[name] = len(statements) / elapsed
+            trees.add(AstSerializer().serialize(statements))
+        if len(trees) != 1:
+            print(f"{workload}: parsers built different trees", file=sys.stderr)
+            sys.exit(1)
+        print(f"{workload:<20}{len(statements):>12}" + "".join(f"{rates[name]:>16,.0f}" for name in PARSERS) + f"{rates['pratt'] / rates['parser']:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
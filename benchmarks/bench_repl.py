@@ -0,0 +1,53 @@
+# Per-input REPL latency as the session grows: every input declares a new
+# global and every tenth is a multi-line block, so a REPL that rescanned or
+# re-executed its history would slow down from one window to the next.
+#
+#   python -m benchmarks.bench_repl [inputs]
+
+import io
+import os
+import sys
+import time
+from app.runtime.lox_runtime import LoxRuntime
+from app.runtime.repl import Repl
+
+
+WINDOWS = 5
+
+
+def session_input(index):
+    if index == 0:
+        return ["var v0 = 0;"]
+    if index % 10 == 0:
+        return [
+            "{",
+            f"  var local = v{index - 1} + 1;",
+            "  print local;",
+            "}",
+            f"var v{index} =",
+            f"  v{index - 1} + 1;",
+        ]
+    return [f"var v{index} = v{index - 1} + 1; print v{index};"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with open(os.devnull, "w") as devnull:
+        repl = Repl(LoxRuntime({"no-cache": True}, devnull), io.StringIO())
+        window = count // WINDOWS
+        print(f"{'inputs':>16}{'time':>10}{'us/input':>12}")
+        index = 0
+        for number in range(WINDOWS):
+            lines = []
+            for offset in range(window):
+                lines.extend(session_input(index + offset))
+            start = time.perf_counter()
+            for line in lines:
+                repl.feed(line)
+            elapsed = time.perf_counter() - start
+            print(f"{index:>7}-{index + window:<8}{elapsed:>9.2f}s{elapsed / window * 1e6:>12.1f}")
+            index += window
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Runs per second for many small scripts: one process per script through
+# the CLI against one LoxRuntime reused in-process.
+#
+#   python -m benchmarks.bench_runtime [scripts]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from app.runtime.lox_runtime import LoxRuntime
+from benchmarks import workloads
+
+
+def script(index):
+    # Distinct sources, so the parse cache cannot serve them all
+    return workloads.numeric_loop(20) + f"print {index};\n"
+
+
+def measure_processes(sources):
+    paths = []
+    for source in sources:
+        with tempfile.NamedTemporaryFile("w", suffix=".lox", delete=False) as file:
+            file.write(source)
+            paths.append(file.name)
+    try:
+        start = time.perf_counter()
+        for path in paths:
+            subprocess.run([sys.executable, "-m", "app.main", "interpret", path, "--no-cache"], stdout=subprocess.DEVNULL)
+        return time.perf_counter() - start
+    finally:
+        for path in paths:
+            os.unlink(path)
+
+
+def measure_runtime(sources, options):
+    runtime = LoxRuntime(options)
+    start = time.perf_counter()
+    for source in sources:
+        result = runtime.run(source)
+        if not result.ok:
+            print(f"run failed: {result.diagnostics}", file=sys.stderr)
+            sys.exit(1)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sources = [script(index) for index in range(count)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        configurations = {
+            # A process per script costs start-up every time; fewer of them
+            "process per script": (measure_processes, sources[:max(1, count // 20)]),
+            "LoxRuntime": (lambda batch: measure_runtime(batch, {"no-cache": True}), sources),
+            "LoxRuntime, cache miss": (lambda batch: measure_runtime(batch, {"cache-dir": cache_dir}), sources),
+            "LoxRuntime, cache hit": (lambda batch: measure_runtime(batch, {"cache-dir": cache_dir}), sources),
+        }
+        print(f"{'configuration':<24}{'scripts':>10}{'time':>10}{'runs/s':>12}")
+        for name, (measure, batch) in configurations.items():
+            elapsed = measure(batch)
+            print(f"{name:<24}{len(batch):>10}{elapsed:>9.2f}s{len(batch) / elapsed:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Tokens-per-second and resident token memory of Scanner, RegexScanner and
+# BufferScanner.
+#
+#   python -m benchmarks.bench_scanner [statements]
+
+import sys
+import time
+import tracemalloc
+from app.scanner.scanner import Scanner
+from app.scanner.regex_scanner import RegexScanner
+from app.scanner.buffer_scanner import BufferScanner
+from benchmarks import workloads
+
+
+SCANNERS = {
+    "scanner": Scanner,
+    "regex": RegexScanner,
+    "buffer": BufferScanner,
+}
+
+
+def measure(scanner_class, source, repeat=3):
+    best = None
+    tokens = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = scanner_class(source).scan_tokens()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, tokens
+
+
+def token_memory(scanner_class, source):
+    tracemalloc.start()
+    tokens = scanner_class(source).scan_tokens()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tokens
+    return size
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    source = workloads.mixed_source(statements)
+    print(f"source: {len(source) / 1e6:.1f} MB, {statements} statements")
+
+    reference = None
+    for name, scanner_class in SCANNERS.items():
+        elapsed, tokens = measure(scanner_class, source)
+        stream = [(str(token), token.line) for token in tokens]
+        if reference is None:
+            reference = stream
+        elif stream != reference:
+            print(f"{name}: token stream differs from the reference scanner", file=sys.stderr)
+            sys.exit(1)
+        size = token_memory(scanner_class, source)
+        print(f"{name:<10}{len(tokens) / elapsed:>14,.0f} tokens/s{elapsed:>10.3f}s"
+              f"{size / 1e6:>10.1f} MB{size / len(tokens):>8.1f} B/token")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Compares the tree-walk Interpreter, its quickening variant, the closure
+# compiler and the bytecode VM.
+#
+#   python -m benchmarks.bench_vm [repeat]
+
+import contextlib
+import io
+import sys
+import time
+from app.scanner.scanner import Scanner
+from app.parser.parser import Parser
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.resolver import Resolver
+from app.interpreter.closure_compiler import ClosureInterpreter
+from app.interpreter.quickening_interpreter import QuickeningInterpreter
+from app.vm.compiler import Compiler
+from app.vm.vm import VM
+from benchmarks import workloads
+
+
+WORKLOADS = {
+    "numeric_loop": workloads.numeric_loop(100000),
+    "while_loop": workloads.while_loop(100000),
+    "nested_blocks": workloads.nested_blocks(20, 2000),
+    "string_concat": workloads.string_concat(5000),
+    "string_builder": workloads.string_builder(20000),
+    "wide_expression": workloads.wide_expression(200, 200),
+}
+
+
+def run_interpreter(statements):
+    Interpreter().interpret(statements)
+
+
+def run_quickening(statements):
+    QuickeningInterpreter().interpret(statements)
+
+
+def run_closures(statements):
+    ClosureInterpreter().interpret(statements)
+
+
+def run_vm(statements):
+    VM().interpret(Compiler().compile(statements))
+
+
+ENGINES = {
+    "interpreter": run_interpreter,
+    "quickening": run_quickening,
+    "closures": run_closures,
+    "vm": run_vm,
+}
+
+
+def measure(engine, source, repeat):
+    best = None
+    output = None
+    for _ in range(repeat):
+        statements = Parser(Scanner(source).scan_tokens()).parse()
+        Resolver().resolve(statements)
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(buffer):
+            engine(statements)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        output = buffer.getvalue()
+    return best, output
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    print(f"{'workload':<16}" + "".join(f"{name:>14}" for name in ENGINES) + f"{'vm speedup':>12}")
+    for workload, source in WORKLOADS.items():
+        timings = {}
+        outputs = set()
+        for name, engine in ENGINES.items():
+            timings[name], output = measure(engine, source, repeat)
+            outputs.add(output)
+        if len(outputs) != 1:
+            print(f"{workload}: engines produced different output", file=sys.stderr)
+            sys.exit(1)
+        speedup = timings["interpreter"] / timings["vm"]
+        print(f"{workload:<16}" + "".join(f"{timings[name]:>13.3f}s" for name in ENGINES) + f"{speedup:>11.2f}x")
+
+
+if __name__ == "__main__":
+    main()
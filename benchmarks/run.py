@@ -0,0 +1,157 @@
+# Benchmark suite with per-phase timings and a stored baseline.
+#
+# Every workload is timed through Scanner.scan_tokens, Parser.parse,
+# Resolver.resolve and Interpreter.interpret separately (best of --repeat
+# runs). Results are written as JSON and compared against a baseline file;
+# any phase slower than the baseline by more than --threshold is reported as
+# a regression and makes the run exit with status 1.
+#
+#   python -m benchmarks.run
+#   python -m benchmarks.run --threshold=0.1 --output=results.json
+#   python -m benchmarks.run --update-baseline
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from app.scanner.scanner import Scanner
+from app.parser.parser import Parser
+from app.interpreter.interpreter import Interpreter
+from app.interpreter.resolver import Resolver
+from app.output.output_sink import OutputSink
+from benchmarks import workloads
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+SUITE = {
+    "numeric_while": lambda: workloads.while_loop(50000),
+    "numeric_for": lambda: workloads.numeric_loop(50000),
+    "nested_blocks": lambda: workloads.nested_blocks(40, 2000),
+    "string_concat_loop": lambda: workloads.string_concat(20000),
+    "string_concat_chain": lambda: workloads.concat_chain(200, 500),
+    "wide_expression": lambda: workloads.wide_expression(200, 300),
+    "large_generated": lambda: workloads.generated_program(20000),
+}
+
+PHASES = ("scan", "parse", "resolve", "interpret")
+
+# Phases faster than this are dominated by timer noise and never flagged
+MIN_SECONDS = 0.005
+
+
+def time_phases(source):
+    timings = {}
+
+    start = time.perf_counter()
+    tokens = Scanner(source).scan_tokens()
+    timings["scan"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    statements = Parser(tokens).parse()
+    timings["parse"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    Resolver().resolve(statements)
+    timings["resolve"] = time.perf_counter() - start
+
+    with open(os.devnull, "w") as devnull:
+        interpreter = Interpreter(OutputSink(devnull))
+        start = time.perf_counter()
+        interpreter.interpret(statements)
+        timings["interpret"] = time.perf_counter() - start
+
+    return timings
+
+
+def run_suite(names, repeat):
+    results = {}
+    for name in names:
+        source = SUITE[name]()
+        best = None
+        for _ in range(repeat):
+            timings = time_phases(source)
+            if best is None:
+                best = timings
+            else:
+                best = {phase: min(best[phase], timings[phase]) for phase in PHASES}
+        best["total"] = sum(best[phase] for phase in PHASES)
+        results[name] = best
+        print(f"{name:<22}" + "".join(f"{best[phase]:>11.4f}" for phase in PHASES + ("total",)), flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, timings in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for phase in PHASES:
+            before = expected.get(phase)
+            after = timings[phase]
+            if before is None or max(before, after) < MIN_SECONDS:
+                continue
+            ratio = after / before if before else float("inf")
+            if ratio > 1 + threshold:
+                regressions.append((name, phase, before, after, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", action="append", choices=sorted(SUITE), help="run only these workloads")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown per phase as a fraction (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    names = args.only or list(SUITE)
+    print(f"{'workload':<22}" + "".join(f"{phase:>11}" for phase in PHASES + ("total",)))
+    results = run_suite(names, args.repeat)
+
+    document = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(document, file, indent=2)
+
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                previous = json.load(file)["results"]
+            previous.update(results)
+            document["results"] = previous
+        with open(args.baseline, "w") as file:
+            json.dump(document, file, indent=2)
+            file.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    if not regressions:
+        print(f"no phase slower than baseline by more than {args.threshold:.0%}")
+        return
+
+    for name, phase, before, after, ratio in regressions:
+        print(f"REGRESSION {name}.{phase}: {before:.4f}s -> {after:.4f}s ({ratio:.2f}x)")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# Generators for synthetic Lox programs used by the benchmark scripts.
+
+
+def numeric_loop(iterations=100000):
+    return (
+        "var sum = 0;\n"
+        f"for (var i = 0; i < {iterations}; i = i + 1) {{\n"
+        "  sum = sum + i * 2 - 1;\n"
+        "}\n"
+        "print sum;\n"
+    )
+
+
+def while_loop(iterations=100000):
+    return (
+        f"var n = {iterations};\n"
+        "var total = 0;\n"
+        "while (n > 0) {\n"
+        "  if (n / 2 > 10) total = total + 1; else total = total - 1;\n"
+        "  n = n - 1;\n"
+        "}\n"
+        "print total;\n"
+    )
+
+
+def nested_blocks(depth=50, iterations=2000):
+    opening = "".join(f"{{ var v{level} = {level};\n" for level in range(depth))
+    closing = "}\n" * depth
+    return (
+        "var acc = 0;\n"
+        f"for (var i = 0; i < {iterations}; i = i + 1) {{\n"
+        f"{opening}"
+        "acc = acc + v0 + i;\n"
+        f"{closing}"
+        "}\n"
+        "print acc;\n"
+    )
+
+
+def string_concat(iterations=5000):
+    return (
+        'var s = "";\n'
+        f"for (var i = 0; i < {iterations}; i = i + 1) {{\n"
+        '  s = s + "x" + i;\n'
+        "}\n"
+        "print s == s;\n"
+    )
+
+
+def string_builder(lines=20000):
+    # Builds one large report string; quadratic without ropes
+    return (
+        'var report = "";\n'
+        f"for (var i = 0; i < {lines}; i = i + 1) {{\n"
+        '  report = report + "line " + i + ": ok\\n";\n'
+        "}\n"
+        'print report == report + "";\n'
+    )
+
+
+def wide_expression(width=500, iterations=200):
+    terms = " + ".join(f"x * {index}" for index in range(width))
+    return (
+        "var x = 1;\n"
+        "var r = 0;\n"
+        f"for (var i = 0; i < {iterations}; i = i + 1) {{\n"
+        f"  r = {terms};\n"
+        "}\n"
+        "print r;\n"
+    )
+
+
+def straight_line(statements=10000):
+    lines = [f"var a{index} = {index} * 2 + 1;" for index in range(statements)]
+    lines.append("print a0;")
+    return "\n".join(lines) + "\n"
+
+
+def print_heavy(lines=20000):
+    return (
+        f"for (var i = 0; i < {lines}; i = i + 1) {{\n"
+        '  print "line " + i;\n'
+        "}\n"
+    )
+
+
+def mixed_source(statements=100000):
+    # Exercises every lexical class: keywords, identifiers, numbers, strings,
+    # comments and one/two-character operators.
+    templates = [
+        "var value{n} = {n}.5 * (count - {n}) / 2; // running total\n",
+        'if (value{n} >= {n} and !done) print "item " + value{n};\n',
+        "while (index{n} <= {n}) {{ index{n} = index{n} + 1; }}\n",
+        'var label{n} = "multi\nline {n}" != nil or false;\n',
+    ]
+    return "".join(templates[n % len(templates)].format(n=n) for n in range(statements))
+
+
+def generated_program(statements=100000):
+    # Shape of our machine-generated scripts: declarations, arithmetic,
+    # conditionals and small loops over a rolling set of variables.
+    templates = [
+        "var v{n} = {n} * 2 + (v{q} - 1) / 3;\n",
+        'if (v{p} > {n}) {{ print "big"; }} else {{ v{p} = v{p} + 1; }}\n',
+        "if (v{p} >= {n} and v{p} != nil or !false) v{p} = -v{p} * 2 + {n};\n",
+        'print "value " + v{p};\n',
+    ]
+    lines = ["var v0 = 0;\n"]
+    for n in range(1, statements):
+        # v{p} is declared by the first statement of each group of four,
+        # v{q} by the group before it
+        p = n - n % len(templates)
+        q = max(p - len(templates), 0)
+        lines.append(templates[n % len(templates)].format(n=n, p=p, q=q))
+    return "".join(lines)
+
+
+def concat_chain(terms=200, iterations=500):
+    chain = " + ".join(f'"s{index}"' for index in range(terms))
+    return (
+        "var s;\n"
+        f"for (var i = 0; i < {iterations}; i = i + 1) {{\n"
+        f"  s = {chain} + i;\n"
+        "}\n"
+        "print s;\n"
+    )
+
+
+# Deeply nested programs; each prints one value regardless of depth
+
+def deep_chain(depth=10000):
+    # Left-nested: ((1 + 1) + 1) + ...
+    return "print " + " + ".join(["1"] * depth) + ";\n"
+
+
+def deep_groups(depth=10000):
+    return "print " + "(" * depth + "1" + ")" * depth + ";\n"
+
+
+def deep_unary(depth=10000):
+    return "print " + "-" * depth + "1;\n"
+
+
+def deep_blocks(depth=10000):
+    return (
+        "var total = 0;\n"
+        + "{ var v = 1; total = total + v;\n" * depth
+        + "print total;\n"
+        + "}" * depth + "\n"
+    )
@@ -0,0 +1,79 @@
+import threading
+import time
+from app.runtime.lox_runtime import LoxRuntime
+
+
+HEAVY_LOOP = "var x = 0; while (true) {" + " x = x + 1;" * 3000 + " }"
+TIGHT_LOOP = "var x = 0; while (true) { x = x + 1; }"
+
+ENGINES = [
+    ("interpret", {}),
+    ("interpret", {"compile": "closures"}),
+    ("interpret", {"quicken": True}),
+    ("run-vm", {}),
+]
+
+
+def run(source, command, options):
+    runtime = LoxRuntime(options)
+    start = time.perf_counter()
+    result = runtime.run(source, command)
+    return result, time.perf_counter() - start
+
+
+def test_timeout_stops_heavy_loop_body():
+    # Each iteration takes milliseconds, so the deadline has to be read on
+    # every back-edge rather than every so many iterations
+    for command, options in ENGINES:
+        result, elapsed = run(HEAVY_LOOP, command, dict(options, timeout="100"))
+        assert [str(diagnostic) for diagnostic in result.diagnostics] == ["Budget Exceeded: Time limit of 0.1s exceeded."]
+        assert elapsed < 1.0, (command, options, elapsed)
+
+
+def test_timeout_stops_tight_loop():
+    for command, options in ENGINES:
+        result, elapsed = run(TIGHT_LOOP, command, dict(options, timeout="100"))
+        assert [str(diagnostic) for diagnostic in result.diagnostics] == ["Budget Exceeded: Time limit of 0.1s exceeded."]
+        assert elapsed < 1.0, (command, options, elapsed)
+
+
+def test_step_limit():
+    source = "var i = 0; while (i < 10) { i = i + 1; } print i;"
+    for command, options in ENGINES:
+        result, _ = run(source, command, dict(options, **{"max-steps": "10"}))
+        assert result.ok and result.output == "10\n"
+        result, _ = run(source, command, dict(options, **{"max-steps": "9"}))
+        assert [str(diagnostic) for diagnostic in result.diagnostics] == ["Budget Exceeded: Step limit of 9 exceeded."]
+
+
+def test_string_limit():
+    source = 'var s = "ab"; var i = 0; while (i < 5) { s = s + s; i = i + 1; } print s;'
+    for command, options in ENGINES + [("interpret", {"opt": True}), ("interpret", {"opt": True, "compile": "closures"})]:
+        result, _ = run(source, command, dict(options, **{"max-string": "64"}))
+        assert result.ok and result.output == "ab" * 32 + "\n", (command, options)
+        result, _ = run(source, command, dict(options, **{"max-string": "63"}))
+        assert [str(diagnostic) for diagnostic in result.diagnostics] == ["Budget Exceeded: String length limit of 63 exceeded."]
+
+
+def test_string_limit_applies_to_folded_constants():
+    result, _ = run('print "abcdef" + "ghijkl";', "interpret", {"opt": True, "max-string": "10"})
+    assert [str(diagnostic) for diagnostic in result.diagnostics] == ["Budget Exceeded: String length limit of 10 exceeded."]
+
+
+def test_string_limit_belongs_to_its_runtime():
+    # A runtime with a limit must not impose it on another one running at
+    # the same time in the same process
+    limited = LoxRuntime({"max-string": "10"})
+    unlimited = LoxRuntime()
+    results = {}
+
+    def run_limited():
+        results["limited"] = limited.run('var i = 0; while (i < 300000) { i = i + 1; } print "a" + "b";')
+
+    thread = threading.Thread(target=run_limited)
+    thread.start()
+    time.sleep(0.05)
+    results["unlimited"] = unlimited.run('print "' + "x" * 20 + '" + "' + "y" * 20 + '";')
+    thread.join()
+    assert results["unlimited"].ok and results["unlimited"].output == "x" * 20 + "y" * 20 + "\n"
+    assert results["limited"].ok and results["limited"].output == "ab\n"
@@ -0,0 +1,41 @@
+from app.runtime.lox_runtime import LoxRuntime
+
+
+DEPTH = 3000
+
+PROGRAMS = {
+    "sum": ("print " + " + ".join(["1"] * DEPTH) + ";", f"{DEPTH}\n"),
+    "and": ("print " + " and ".join(["1"] * DEPTH) + ";", "1\n"),
+    "grouping": ("print " + "(" * DEPTH + "1" + ")" * DEPTH + ";", "1\n"),
+    "negation": ("print " + "-" * (DEPTH + 1) + "1;", "-1\n"),
+    "blocks": ("var i = 0;" + "{ var a = 1; " * DEPTH + "while (i < 2) { print a + i; i = i + 1; }" + " }" * DEPTH,
+               "1\n2\n"),
+    "ifs": ("if (true) " * DEPTH + "print 7;", "7\n"),
+}
+
+
+def run(source, command="interpret", options=None):
+    result = LoxRuntime(options).run(source, command)
+    return result.output, [str(diagnostic) for diagnostic in result.diagnostics]
+
+
+def check(command, options=None):
+    for name, (source, expected) in PROGRAMS.items():
+        assert run(source, command, options) == (expected, []), name
+
+
+def test_deep_programs_interpret():
+    check("interpret")
+
+
+def test_deep_programs_run_vm():
+    check("run-vm")
+
+
+def test_deep_programs_compile_closures():
+    check("interpret", {"compile": "closures"})
+
+
+def test_deep_programs_opt():
+    check("interpret", {"opt": True})
+    check("interpret", {"opt": True, "compile": "closures"})
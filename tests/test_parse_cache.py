@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+from app.runtime.lox_runtime import LoxRuntime
+from app.runtime.batch_runner import BatchRunner, OK
+
+
+SOURCE = "var a = 1; print a + 1;"
+
+
+def cache_entries(directory):
+    if not os.path.isdir(directory):
+        return []
+    return [name for name in os.listdir(directory) if name.endswith(".loxast")]
+
+
+def test_runtime_does_not_cache_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert LoxRuntime().run(SOURCE).output == "2\n"
+    assert cache_entries(tmp_path / "lox") == []
+
+
+def test_runtime_caches_when_asked(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert LoxRuntime({"cache": True}).run(SOURCE).output == "2\n"
+    assert len(cache_entries(tmp_path / "lox")) == 1
+
+    directory = tmp_path / "explicit"
+    runtime = LoxRuntime({"cache-dir": str(directory)})
+    assert runtime.run(SOURCE).output == "2\n"
+    assert runtime.run(SOURCE).output == "2\n"
+    assert len(cache_entries(directory)) == 1
+
+
+def test_batch_workers_do_not_cache_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    job = tmp_path / "job.lox"
+    job.write_text(SOURCE)
+    results = list(BatchRunner({}, 1).run([str(job)]))
+    assert [(result.status, result.stdout) for result in results] == [(OK, "2\n")]
+    assert cache_entries(tmp_path / "lox") == []
+
+
+def test_cli_caches_by_default(tmp_path):
+    script = tmp_path / "script.lox"
+    script.write_text(SOURCE)
+    environment = dict(os.environ, XDG_CACHE_HOME=str(tmp_path))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def interpret(*options):
+        return subprocess.run([sys.executable, "-m", "app.main", "interpret", str(script), *options],
+                              cwd=root, env=environment, capture_output=True, text=True)
+
+    assert interpret("--no-cache").stdout == "2\n"
+    assert cache_entries(tmp_path / "lox") == []
+    assert interpret().stdout == "2\n"
+    assert len(cache_entries(tmp_path / "lox")) == 1
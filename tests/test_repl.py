@@ -0,0 +1,47 @@
+import io
+from app.runtime.lox_runtime import LoxRuntime
+from app.runtime.repl import Repl
+
+
+def run_session(lines, options=None):
+    output = io.StringIO()
+    errors = io.StringIO()
+    runtime = LoxRuntime(options, output)
+    Repl(runtime, errors).run(lines)
+    return output.getvalue(), errors.getvalue()
+
+
+def test_globals_persist_across_inputs():
+    output, errors = run_session(["var a = 1;", "var b = a + 1;", "print a + b;"])
+    assert output == "3\n"
+    assert errors == ""
+
+
+def test_unfinished_statement_continues_on_next_line():
+    output, errors = run_session(["if (true)", "  print \"yes\";", "{", "print 1;", "}"])
+    assert output == "yes\n1\n"
+    assert errors == ""
+
+
+def test_opt_types_inputs_with_earlier_globals():
+    # x is a string until the loop assigns a number, so -x must stay checked
+    output, errors = run_session([
+        "var x = \"s\";",
+        "var i = 0;",
+        "while (i < 1) { print -x; x = 1; i = i + 1; }",
+        "print \"after\";",
+    ], {"opt": True})
+    assert output == "after\n"
+    assert errors == "Runtime Error: Operand must be a number.\n"
+
+
+def test_opt_session_keeps_running_after_widening():
+    output, errors = run_session([
+        "var n = 2;",
+        "print -n;",
+        "n = \"two\";",
+        "print -n;",
+        "print n + \"!\";",
+    ], {"opt": True})
+    assert output == "-2\ntwo!\n"
+    assert errors == "Runtime Error: Operand must be a number.\n"
@@ -0,0 +1,63 @@
+import io
+import os
+import subprocess
+import sys
+import pytest
+from app.scanner.scanner import Scanner
+from app.parser.parser import Parser
+from app.interpreter.instrumented_interpreter import InstrumentedInterpreter
+from app.interpreter.resolver import Resolver
+from app.output.output_sink import OutputSink
+from app.profiler.profiler import Profiler
+from app.runtime.lox_runtime import LoxRuntime
+from app.stats.stats import Stats
+
+
+def count_environments(source, elide_scopes=True):
+    stats = Stats()
+    output = io.StringIO()
+    statements = Resolver(elide_scopes).resolve(Parser(Scanner(source).scan_tokens()).parse())
+    InstrumentedInterpreter(stats, OutputSink(output)).interpret(statements)
+    return stats.environments, output.getvalue()
+
+
+def test_block_environments_are_counted():
+    # Globals, the outer block and one inner block per iteration
+    source = "{ var i = 0; while (i < 3) { var j = i; print j; i = i + 1; } }"
+    assert count_environments(source) == (5, "0\n1\n2\n")
+
+
+def test_counted_loop_environment_is_counted():
+    # Without scope elision the loop body keeps its scope, and the counted
+    # loop fast path creates one environment for all of its iterations
+    source = "{ var i = 0; while (i < 3) { print i; i = i + 1; } }"
+    assert count_environments(source, elide_scopes=False) == (3, "0\n1\n2\n")
+
+
+def test_stack_evaluator_environments_are_counted():
+    depth = 400
+    source = "{ var a = 1; " * depth + "print a;" + " }" * depth
+    stats = Stats()
+    result = LoxRuntime().run(source, "interpret", stats)
+    assert result.output == "1\n"
+    assert stats.environments == depth + 1
+
+
+def test_stats_rejected_for_other_engines():
+    source = "{ var a = 1; print a; }"
+    for options in ({"compile": "closures"}, {"quicken": True}):
+        with pytest.raises(ValueError, match="--stats cannot be combined"):
+            LoxRuntime(options).run(source, "interpret", Stats())
+    with pytest.raises(ValueError, match="--stats cannot be combined"):
+        LoxRuntime().run(source, "interpret", Stats(), Profiler(0.001))
+
+
+def test_cli_rejects_stats_for_other_engines(tmp_path):
+    script = tmp_path / "script.lox"
+    script.write_text("print 1;")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for option in ("--compile=closures", "--quicken", "--profile"):
+        result = subprocess.run([sys.executable, "-m", "app.main", "interpret", str(script), "--stats", option],
+                                cwd=root, capture_output=True, text=True)
+        assert (result.returncode, result.stdout) == (1, "")
+        assert "--stats cannot be combined" in result.stderr